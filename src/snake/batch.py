@@ -0,0 +1,120 @@
+import numpy as np
+from grid import *
+from planner import DistanceField
+
+class BatchPaths:
+    """
+    Results of a batch of (start, goal) queries on one map.
+    lengths[q] = number of steps of a shortest path for query q (-1 if
+    unreachable). Paths themselves are only rebuilt when asked for, from one
+    resumable DistanceField per goal, shared by the queries to that goal.
+    """
+    def __init__(self, mask, starts, goals, lengths):
+        self.mask = mask
+        self.starts, self.goals = starts, goals
+        self.lengths = lengths
+        self.grid = None
+        self.fields = {}
+
+    def path(self, q):
+        """
+        Returns the direction list of query q ([] if unreachable).
+        """
+        if self.lengths[q] < 0:
+            return []
+        if self.grid is None:
+            rows, cols = self.mask.shape
+            self.grid = Grid.from_cells(self.mask.astype(np.uint8).tobytes(), rows, cols)
+        start, goal = int(self.grid.index(self.starts[q])), int(self.grid.index(self.goals[q]))
+        field = self.fields.get(goal)
+        if field is None:
+            field = self.fields[goal] = DistanceField(self.grid, goal)
+        return field.path(start)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __getitem__(self, q):
+        return self.path(q)
+
+def obstacle_mask(obstacles, rows, cols):
+    """
+    Returns a (rows, cols) bool array, True on obstacles, from a Grid or a set.
+    """
+    if isinstance(obstacles, Grid):
+        return np.frombuffer(bytes(obstacles.cells), dtype=np.uint8).reshape(rows, cols) != 0
+    mask = np.zeros((rows, cols), dtype=bool)
+    for r, c in obstacles:
+        if 0 <= r < rows and 0 <= c < cols:
+            mask[r, c] = True
+    return mask
+
+def neighbour_table(mask):
+    """
+    Returns an (rows * cols, 4) array: flat index of the free neighbour in
+    each direction of DIRECTIONS, -1 where blocked (and on obstacle cells).
+    """
+    rows, cols = mask.shape
+    free = ~mask.ravel()
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    table = np.full((rows * cols, 4), -1, dtype=np.intp)
+    for k, (dr, dc) in enumerate(DIRECTIONS):
+        inside = (0 <= r + dr) & (r + dr < rows) & (0 <= c + dc) & (c + dc < cols)
+        target = np.where(inside, (r + dr) * cols + c + dc, 0)
+        ok = inside & free & free[target]
+        table[ok, k] = target[ok]
+    return table
+
+def batch_search(mask, starts, goals, max_states=1 << 22):
+    """
+    Shortest path lengths of many (start, goal) queries on one obstacle mask.
+    starts and goals are (n, 2) arrays of (row, col). Distances are symmetric,
+    so one BFS is grown per unique cell of whichever side has fewer of them.
+    The BFSs of a chunk of roots advance together as one array of
+    root * cells + cell states, so each step costs the size of the joint
+    frontier; chunks hold at most max_states states and stop once all their
+    queries are answered. Returns BatchPaths.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows, cols = mask.shape
+    n = rows * cols
+    starts = np.asarray(starts, dtype=np.intp).reshape(-1, 2)
+    goals = np.asarray(goals, dtype=np.intp).reshape(-1, 2)
+    lengths = np.full(len(starts), -1, dtype=np.int32)
+    if not len(starts):
+        return BatchPaths(mask, starts, goals, lengths)
+    flat_starts = starts[:, 0] * cols + starts[:, 1]
+    flat_goals = goals[:, 0] * cols + goals[:, 1]
+    sources, targets = flat_goals, flat_starts
+    if len(np.unique(flat_starts)) < len(np.unique(flat_goals)):
+        sources, targets = flat_starts, flat_goals
+    # Queries from or to an obstacle have no path
+    valid = np.flatnonzero(~mask.ravel()[flat_starts] & ~mask.ravel()[flat_goals])
+    if not len(valid):
+        return BatchPaths(mask, starts, goals, lengths)
+    roots, slot = np.unique(sources[valid], return_inverse=True)
+    table = neighbour_table(mask)
+    chunk = max(1, max_states // n)
+    for lo in range(0, len(roots), chunk):
+        m = min(chunk, len(roots) - lo)
+        mine = (slot >= lo) & (slot < lo + m)
+        queries = valid[mine]
+        wanted = (slot[mine] - lo) * n + targets[queries]
+        dist = np.full(m * n, -1, dtype=np.int32)
+        owner = np.empty(m * n, dtype=np.intp)
+        frontier = np.arange(m) * n + roots[lo:lo + m]
+        dist[frontier] = 0
+        step = 0
+        while len(frontier) and (dist[wanted] < 0).any():
+            step += 1
+            cells = frontier % n
+            nbrs = table[cells]
+            new = (frontier - cells)[:, None] + nbrs
+            new = new[(nbrs >= 0) & (dist[new] < 0)]
+            # Several frontier cells can reach the same cell: keep one copy
+            owner[new] = np.arange(len(new))
+            new = new[owner[new] == np.arange(len(new))]
+            dist[new] = step
+            frontier = new
+        lengths[queries] = dist[wanted]
+    return BatchPaths(mask, starts, goals, lengths)
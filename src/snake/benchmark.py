@@ -0,0 +1,174 @@
+import argparse
+import csv
+import functools
+import sys
+import time
+from search_algorithms import *
+from maps import *
+import stats
+
+# Benchmark suite: every search on seeded generated maps of growing size,
+# time, expansions and peak memory per run, written as csv. With --baseline
+# the results are compared against an earlier csv and regressions reported.
+# Usage: python benchmark.py [--sizes 25 100 500] [--maps maze rooms] [--algorithms bfs a*]
+#                            [--seeds N] [--repeat N] [--out FILE] [--baseline FILE] [--tolerance 0.25]
+
+# Reference BFS copying the path on every expansion (the previous approach)
+@instrumented
+def bfs_path_copy(start, goal, obstacles, rows, cols):
+    q = stats.deque([(start, [])])
+    v = set([start])
+    while q:
+        cur, path = q.popleft()
+        if cur == goal:
+            return path
+        for dir in DIRECTIONS:
+            new = (cur[0] + dir[0], cur[1] + dir[1])
+            if (0 <= new[0] < rows and 0 <= new[1] < cols and
+                new not in obstacles and new not in v):
+                v.add(new)
+                q.append((new, path + [dir]))
+    return []
+
+BUDGET = 256
+
+# Searches and heuristic variants
+SEARCHES = {"bfs": bfs, "dfs": dfs, "ucs": ucs, "ids": ids, "greedy_bfs": greedy_bfs,
+            "a*": astar,
+            "a*/euclidean": functools.partial(astar, heuristic=euclidean_distance),
+            "a*/manhattan": functools.partial(astar, heuristic=manhattan_distance),
+            "bidirectional_bfs": bidirectional_bfs, "jps": jps,
+            "ida*": ida_star,
+            "ida*/euclidean": functools.partial(ida_star, heuristic=euclidean_distance),
+            "bfs (path copy)": bfs_path_copy,
+            # Memory-bounded mode, frontier budget of BUDGET entries
+            "bfs/bounded": functools.partial(bfs, budget=BUDGET),
+            "ucs/bounded": functools.partial(ucs, budget=BUDGET),
+            "a*/bounded": functools.partial(astar, budget=BUDGET)}
+
+# Largest grid (cells) each search is run on, the others run on every size.
+# Iterative deepening re-expands the whole map once per depth on long paths.
+MAX_CELLS = {"ids": 50 * 50, "ida*": 50 * 50, "ida*/euclidean": 50 * 50, "bfs (path copy)": 100 * 100}
+
+SIZES = [25, 50, 100, 200, 500, 1000, 2000]
+
+FIELDS = ["map", "size", "seed", "algorithm", "time", "expanded", "generated",
+          "peak_frontier", "peak_memory", "path_length"]
+
+def measure(search, start, goal, obstacles, rows, cols, memory=True, repeat=3):
+    """
+    Returns the stats record of one search: the best time of `repeat` plain
+    runs (instrumentation off), then an instrumented run for the counters
+    and peak memory.
+    """
+    elapsed = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        search(start, goal, obstacles, rows, cols)
+        elapsed = min(elapsed, time.perf_counter() - t)
+    stats.enable(memory)
+    try:
+        search(start, goal, obstacles, rows, cols)
+    finally:
+        stats.disable()
+    record = stats.records.pop()
+    record["time"] = elapsed
+    return record
+
+def run(maps=MAPS, sizes=SIZES, algorithms=SEARCHES, seeds=range(1), memory=True, repeat=3, log=None):
+    """
+    Returns one row (dict with FIELDS) per map x size x seed x algorithm.
+    """
+    rows = []
+    for name in maps:
+        for size in sizes:
+            for seed in seeds:
+                grid, start, goal = MAPS[name](size, size, seed)
+                # Components are labelled per layout, not timed as part of a search
+                grid.components()
+                obstacles = set(grid) if "bfs (path copy)" in algorithms and size * size <= MAX_CELLS["bfs (path copy)"] else None
+                for algorithm in algorithms:
+                    if size * size > MAX_CELLS.get(algorithm, size * size):
+                        continue
+                    obs = obstacles if algorithm == "bfs (path copy)" else grid
+                    record = measure(SEARCHES[algorithm], start, goal, obs, size, size, memory, repeat)
+                    row = {"map": name, "size": size, "seed": seed, "algorithm": algorithm}
+                    row.update((field, record[field]) for field in FIELDS[4:])
+                    rows.append(row)
+                    if log:
+                        log(row)
+    return rows
+
+def write_csv(filename, rows):
+    with open(filename, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def read_csv(filename):
+    with open(filename, newline="") as file:
+        return list(csv.DictReader(file))
+
+def compare(rows, baseline, tolerance=0.25, min_time=0.01):
+    """
+    Matches rows with a baseline (same map, size, seed, algorithm) and returns
+    (row, baseline row, problems) for every match. Problems are a time or
+    peak memory more than tolerance above the baseline (times under min_time
+    are ignored as noise) and changed expansion counts or path lengths.
+    """
+    key = lambda row: (row["map"], int(row["size"]), int(row["seed"]), row["algorithm"])
+    before = {key(row): row for row in baseline}
+    matches = []
+    for row in rows:
+        old = before.get(key(row))
+        if old is None:
+            continue
+        problems = []
+        if float(row["time"]) > max(float(old["time"]), min_time) * (1 + tolerance):
+            problems.append("time")
+        # Runs with --no-memory have no peak to compare
+        if float(old["peak_memory"]) and float(row["peak_memory"]) > float(old["peak_memory"]) * (1 + tolerance):
+            problems.append("memory")
+        for field in ("expanded", "path_length"):
+            if int(row[field]) != int(old[field]):
+                problems.append(field)
+        matches.append((row, old, problems))
+    return matches
+
+def ratio(new, old):
+    return float(new) / float(old) if float(old) else float("inf") if float(new) else 1.0
+
+def print_row(row):
+    print(f"{row['map']:>10} {row['size']:>5} {row['seed']:>4} {row['algorithm']:>17} {row['time']:>10.4f} "
+          f"{row['expanded']:>9} {row['peak_memory'] / 1024:>11.1f} {row['path_length']:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms on generated maps.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="grid sizes (square)")
+    parser.add_argument("--maps", nargs="+", default=list(MAPS), choices=list(MAPS))
+    parser.add_argument("--algorithms", nargs="+", default=list(SEARCHES), choices=list(SEARCHES))
+    parser.add_argument("--seeds", type=int, default=1, help="maps per generator and size")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per search (best one kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster)")
+    parser.add_argument("--out", default="benchmark.csv", help="output csv file")
+    parser.add_argument("--baseline", default=None, metavar="FILE", help="csv of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown / memory growth")
+    args = parser.parse_args()
+
+    print(f"{'map':>10} {'size':>5} {'seed':>4} {'algorithm':>17} {'time (s)':>10} "
+          f"{'expanded':>9} {'peak (KiB)':>11} {'path':>8}")
+    results = run(args.maps, args.sizes, args.algorithms, range(args.seeds), not args.no_memory, args.repeat, print_row)
+    write_csv(args.out, results)
+    print(f"{len(results)} runs written to {args.out}")
+
+    if args.baseline:
+        matches = compare(results, read_csv(args.baseline), args.tolerance)
+        regressions = [m for m in matches if m[2]]
+        print(f"\n{len(matches)} runs compared with {args.baseline}")
+        print(f"{'map':>10} {'size':>5} {'seed':>4} {'algorithm':>17} {'time':>7} {'expanded':>9} {'memory':>7}  problems")
+        for row, old, problems in matches:
+            print(f"{row['map']:>10} {row['size']:>5} {row['seed']:>4} {row['algorithm']:>17} "
+                  f"{ratio(row['time'], old['time']):>6.2f}x {ratio(row['expanded'], old['expanded']):>8.2f}x "
+                  f"{ratio(row['peak_memory'], old['peak_memory']):>6.2f}x  {', '.join(problems)}")
+        print(f"{len(regressions)} regressions")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,94 @@
+import argparse
+import functools
+import random
+import sys
+from search_algorithms import *
+from maps import MAPS
+
+# Checks the optimal searches against bfs: on seeded random grids (obstacle
+# sets and Grids, random start and goal) and on the benchmark maps, every
+# search must return a valid path of the same length as bfs, or [] when bfs
+# does. Exits with status 1 and lists the mismatches if any.
+# Usage: python check_paths.py [--grids N] [--seed N]
+
+# Searches that must return shortest paths
+SEARCHES = {"ucs": ucs,
+            "a*/manhattan": functools.partial(astar, heuristic=manhattan_distance),
+            "a*/euclidean": functools.partial(astar, heuristic=euclidean_distance),
+            "bidirectional_bfs": bidirectional_bfs, "jps": jps,
+            "ids": ids, "ida*": ida_star,
+            "ida*/euclidean": functools.partial(ida_star, heuristic=euclidean_distance)}
+
+# Benchmark map sizes, kept small for the searches that need it
+MAP_SIZES = {"default": 60, "ids": 25, "ida*": 25, "ida*/euclidean": 25}
+
+def follow(path, start, obstacles, rows, cols):
+    """
+    Returns the cell the path ends on, or None if it leaves the grid or hits
+    an obstacle.
+    """
+    r, c = start
+    for dr, dc in path:
+        r, c = r + dr, c + dc
+        if not (0 <= r < rows and 0 <= c < cols) or (r, c) in obstacles:
+            return None
+    return r, c
+
+def compare(name, search, start, goal, obstacles, rows, cols, expected):
+    # Returns a mismatch description, or None
+    path = search(start, goal, obstacles, rows, cols)
+    if len(path) != len(expected) or (path and follow(path, start, obstacles, rows, cols) != goal):
+        return f"{name}: {rows}x{cols} {start} -> {goal}, length {len(path)} (bfs {len(expected)})"
+    return None
+
+def random_grids(count, seed):
+    """
+    Yields (start, goal, obstacles, rows, cols), small grids of mixed density,
+    every other one as a Grid.
+    """
+    rng = random.Random(seed)
+    for n in range(count):
+        rows, cols = rng.randint(1, 16), rng.randint(1, 16)
+        density = rng.choice((0.0, 0.05, 0.15, 0.3, 0.45))
+        obstacles = {(r, c) for r in range(rows) for c in range(cols) if rng.random() < density}
+        free = [(r, c) for r in range(rows) for c in range(cols) if (r, c) not in obstacles]
+        if not free:
+            continue
+        if n % 2:
+            obstacles = Grid(obstacles, rows, cols)
+        yield rng.choice(free), rng.choice(free), obstacles, rows, cols
+
+def check(grids=5000, seed=0):
+    """
+    Returns (searches run, list of mismatch descriptions).
+    """
+    runs = 0
+    mismatches = []
+    for start, goal, obstacles, rows, cols in random_grids(grids, seed):
+        expected = bfs(start, goal, obstacles, rows, cols)
+        for name, search in SEARCHES.items():
+            runs += 1
+            mismatch = compare(name, search, start, goal, obstacles, rows, cols, expected)
+            if mismatch:
+                mismatches.append(mismatch)
+    for map_name, generate in MAPS.items():
+        for name, search in SEARCHES.items():
+            size = MAP_SIZES.get(name, MAP_SIZES["default"])
+            grid, start, goal = generate(size, size, seed)
+            runs += 1
+            mismatch = compare(f"{name} on {map_name}", search, start, goal, grid, size, size,
+                               bfs(start, goal, grid, size, size))
+            if mismatch:
+                mismatches.append(mismatch)
+    return runs, mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the optimal searches against bfs.")
+    parser.add_argument("--grids", type=int, default=5000, help="random grids")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    runs, mismatches = check(args.grids, args.seed)
+    for line in mismatches:
+        print(line)
+    print(f"{runs} searches ({', '.join(SEARCHES)}): {len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,78 @@
+from heapq import heappush, heappop
+
+# Priority of the items forget() dropped: any entry of theirs is stale
+FORGOTTEN = float("-inf")
+
+class Frontier:
+    """
+    Min-priority queue for the informed searches (ucs, greedy_bfs, astar).
+    Plain heapq, no locking: the searches run in a single thread.
+    Ties are broken by insertion order, never by comparing items or data.
+    Decrease-key is done with lazy deletion: pushing an item again with a
+    lower priority leaves the old entry in the heap, it is skipped on pop.
+    Pushing an item with a priority no better than its best one so far
+    (queued or already popped) is a no-op.
+    """
+    __slots__ = ("heap", "best", "counter")
+
+    def __init__(self):
+        self.heap = []    # (priority, insertion counter, item, data)
+        self.best = {}    # item -> lowest priority it was pushed with
+        self.counter = 0
+
+    def push(self, item, priority, data=None):
+        """
+        Adds item (or lowers its priority). Returns False if nothing changed.
+        """
+        best = self.best.get(item)
+        if best is not None and best <= priority:
+            return False
+        self.best[item] = priority
+        self.counter += 1
+        heappush(self.heap, (priority, self.counter, item, data))
+        return True
+
+    def _prune(self):
+        # Drop stale entries superseded by a decrease-key (or forgotten)
+        heap, best = self.heap, self.best
+        while heap and heap[0][0] > best.get(heap[0][2], FORGOTTEN):
+            heappop(heap)
+
+    def pop(self):
+        """
+        Removes and returns (priority, item, data) of the best live entry.
+        """
+        self._prune()
+        priority, _, item, data = heappop(self.heap)
+        return priority, item, data
+
+    def forget(self, item):
+        """
+        Drops the best priority kept for a popped item, for the memory-bounded
+        searches (they track closed cells themselves): its stale entries are
+        skipped, and the item could be pushed again.
+        """
+        self.best.pop(item, None)
+
+    def shrink(self, size):
+        """
+        Keeps the size best live entries and forgets the rest, for the
+        memory-bounded searches: a forgotten item can be pushed again later.
+        Returns the number of entries dropped.
+        """
+        best = self.best
+        live = [entry for entry in self.heap if entry[0] <= best.get(entry[2], FORGOTTEN)]
+        # A sorted list is a valid heap
+        live.sort()
+        for entry in live[size:]:
+            del best[entry[2]]
+        self.heap = live[:size]
+        return len(live) - len(self.heap)
+
+    def __bool__(self):
+        self._prune()
+        return bool(self.heap)
+
+    def __len__(self):
+        # Includes stale entries not yet skipped
+        return len(self.heap)
@@ -0,0 +1,165 @@
+from array import array
+
+# Directions (Up, Down, Left, Right)
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+# Index of the reverse direction (Down, Up, Right, Left)
+OPPOSITE = (1, 0, 3, 2)
+
+# Byte translation: obstacle (1) -> 0, free (0) -> 1
+_FREE = bytes([1, 0]) + bytes(254)
+
+# Direction indices for every 4-bit "open directions" mask (bit k -> DIRECTIONS[k])
+MASK_DIRS = [tuple(k for k in range(4) if mask >> k & 1) for mask in range(16)]
+
+class Grid:
+    """
+    Occupancy grid stored as a flat bytearray indexed by r * cols + c.
+    moves[i] is a precomputed 4-bit mask of the directions that lead to a free
+    in-bounds cell, so expanding a node needs no tuple, bounds check or hashing.
+    Behaves like the obstacle set it was built from (in, iter, len).
+    The grid is treated as immutable: connected components are labelled once,
+    by components().
+    """
+    __slots__ = ("rows", "cols", "cells", "moves", "offsets", "count", "labels")
+
+    def __init__(self, obstacles, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.cells = bytearray(rows * cols)  # 1 = obstacle
+        for r, c in obstacles:
+            if 0 <= r < rows and 0 <= c < cols:
+                self.cells[r * cols + c] = 1
+        self.count = self.cells.count(1)
+        self.offsets = (-cols, cols, -1, 1)
+        self.moves = self._neighbour_table()
+        self.labels = None
+
+    @classmethod
+    def from_cells(cls, cells, rows, cols):
+        """
+        Builds a grid straight from a flat occupancy bytearray (1 = obstacle),
+        without going through a set of tuples (large generated maps).
+        """
+        grid = cls.__new__(cls)
+        grid.rows, grid.cols = rows, cols
+        grid.cells = bytearray(cells)
+        grid.count = grid.cells.count(1)
+        grid.offsets = (-cols, cols, -1, 1)
+        grid.moves = grid._neighbour_table()
+        grid.labels = None
+        return grid
+
+    def _neighbour_table(self):
+        # Whole-grid bit operations on Python ints, one byte per cell (0 or 1):
+        # a direction is open where the cell and its neighbour are both free.
+        # Shifting by a row or a cell brings the neighbour's byte in line, the
+        # edge rows shift in zeros and the column masks cut the row wrap-around
+        rows, cols = self.rows, self.cols
+        n = rows * cols
+        free = int.from_bytes(self.cells.translate(_FREE), "little")
+        row = 8 * cols
+        not_first = int.from_bytes((b"\x00" + b"\x01" * (cols - 1)) * rows, "little")
+        not_last = int.from_bytes((b"\x01" * (cols - 1) + b"\x00") * rows, "little")
+        up = free & (free << row)
+        down = free & (free >> row)
+        left = free & (free << 8) & not_first
+        right = free & (free >> 8) & not_last
+        return bytearray((up | down << 1 | left << 2 | right << 3).to_bytes(n, "little"))
+
+    def components(self):
+        """
+        Returns the connected component label of every cell (0 = obstacle).
+        A flood fill over the whole map on the first call, so call it when
+        the layout is prepared; the searches only use labels already there.
+        """
+        if self.labels is None:
+            moves, offsets = self.moves, self.offsets
+            labels = array("i", bytes(4 * self.rows * self.cols))
+            label = 0
+            for i, cell in enumerate(self.cells):
+                if cell or labels[i]:
+                    continue
+                label += 1
+                labels[i] = label
+                stack = [i]
+                while stack:
+                    cur = stack.pop()
+                    for k in MASK_DIRS[moves[cur]]:
+                        new = cur + offsets[k]
+                        if not labels[new]:
+                            labels[new] = label
+                            stack.append(new)
+            self.labels = labels
+        return self.labels
+
+    def connected(self, a, b):
+        """
+        Returns True if free cells a and b are in the same component. O(1)
+        once components() has run (it is run here otherwise).
+        """
+        labels = self.components()
+        label = labels[a[0] * self.cols + a[1]]
+        return label != 0 and label == labels[b[0] * self.cols + b[1]]
+
+    def index(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def pos(self, i):
+        return divmod(i, self.cols)
+
+    def trace(self, via, start, goal):
+        """
+        Rebuilds the direction list from start to goal out of a parent array,
+        via[i] = 1 + index of the direction used to enter cell i.
+        """
+        path = []
+        offsets = self.offsets
+        i = goal
+        while i != start:
+            k = via[i] - 1
+            path.append(DIRECTIONS[k])
+            i -= offsets[k]
+        path.reverse()
+        return path
+
+    def neighbours(self, i):
+        """
+        Yields (neighbour index, direction) pairs of the free cells next to i.
+        """
+        offsets = self.offsets
+        for k in MASK_DIRS[self.moves[i]]:
+            yield i + offsets[k], DIRECTIONS[k]
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def __contains__(self, pos):
+        return self.in_bounds(pos) and self.cells[pos[0] * self.cols + pos[1]] == 1
+
+    def __iter__(self):
+        cols = self.cols
+        return (divmod(i, cols) for i, cell in enumerate(self.cells) if cell)
+
+    def __len__(self):
+        return self.count
+
+# Grids built from plain obstacle sets, oldest first: (set, frozen copy, grid)
+_converted = []
+CONVERTED_GRIDS = 8
+
+def as_grid(obstacles, rows, cols):
+    """
+    Returns obstacles as a Grid, building one if a plain set was given. The
+    last few sets are remembered, so passing the same (unchanged) set again
+    costs a set comparison instead of a new grid.
+    """
+    if isinstance(obstacles, Grid) and obstacles.rows == rows and obstacles.cols == cols:
+        return obstacles
+    for source, frozen, grid in _converted:
+        if source is obstacles and grid.rows == rows and grid.cols == cols and frozen == obstacles:
+            return grid
+    grid = Grid(obstacles, rows, cols)
+    # Holding on to the set also keeps its id from being reused
+    _converted.append((obstacles, frozenset(obstacles), grid))
+    if len(_converted) > CONVERTED_GRIDS:
+        _converted.pop(0)
+    return grid
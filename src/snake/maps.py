@@ -0,0 +1,96 @@
+import random
+from grid import *
+
+# Seeded map generators for benchmarks. Each returns (grid, start, goal) with
+# start and goal free; the same (rows, cols, seed) always gives the same map.
+# Built on flat bytearrays (1 = obstacle) so 2000x2000 maps stay cheap.
+
+def random_map(rows, cols, seed=0, density=15):
+    """
+    Obstacles on density % of the cells, like the LEVELS of the game.
+    Start and goal are opposite corners, not always connected.
+    """
+    rng = random.Random(seed)
+    n = rows * cols
+    start, goal = 0, n - 1
+    cells = bytearray(n)
+    for i in rng.sample(range(1, n - 1), (n - 2) * density // 100):
+        cells[i] = 1
+    return Grid.from_cells(cells, rows, cols), divmod(start, cols), divmod(goal, cols)
+
+def maze(rows, cols, seed=0):
+    """
+    Perfect maze (a single route between any two cells), carved by a
+    randomized depth-first search over the cells with even coordinates.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(b"\x01") * (rows * cols)
+    cells[0] = 0
+    stack = [(0, 0)]
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 <= r + dr < rows and 0 <= c + dc < cols and cells[(r + dr) * cols + c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(options)
+        # Knock down the wall between the two cells
+        cells[(r + nr) // 2 * cols + (c + nc) // 2] = 0
+        cells[nr * cols + nc] = 0
+        stack.append((nr, nc))
+    goal = ((rows - 1) // 2 * 2, (cols - 1) // 2 * 2)
+    return Grid.from_cells(cells, rows, cols), (0, 0), goal
+
+def rooms(rows, cols, seed=0, size=8):
+    """
+    Square rooms of size - 1 cells separated by one-cell walls, with one door
+    at a random spot in every wall between two neighbouring rooms.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(rows * cols)
+    for r in range(size - 1, rows, size):
+        cells[r * cols:(r + 1) * cols] = b"\x01" * cols
+    for c in range(size - 1, cols, size):
+        cells[c::cols] = b"\x01" * rows
+    for top in range(0, rows, size):
+        height = min(size - 1, rows - top)
+        for left in range(0, cols, size):
+            width = min(size - 1, cols - left)
+            # Door to the room on the right and to the one below
+            if left + size < cols:
+                cells[(top + rng.randrange(height)) * cols + left + size - 1] = 0
+            if top + size < rows:
+                cells[(top + size - 1) * cols + left + rng.randrange(width)] = 0
+    goal = (rows - 1 if (rows - 1) % size != size - 1 else rows - 2,
+            cols - 1 if (cols - 1) % size != size - 1 else cols - 2)
+    return Grid.from_cells(cells, rows, cols), (0, 0), goal
+
+def corridors(rows, cols, seed=0):
+    """
+    Walls on every odd row with a single gap at a random column: long
+    winding corridors, most of the grid has to be crossed.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(rows * cols)
+    for r in range(1, rows, 2):
+        cells[r * cols:(r + 1) * cols] = b"\x01" * cols
+        cells[r * cols + rng.randrange(cols)] = 0
+    goal = ((rows - 1) // 2 * 2, cols - 1)
+    return Grid.from_cells(cells, rows, cols), (0, 0), goal
+
+def serpentine(rows, cols, seed=0):
+    """
+    Maze made of one corridor snaking through the whole grid (walls on every
+    odd row, with gaps alternating between the two ends). Not random.
+    """
+    cells = bytearray(rows * cols)
+    for r in range(1, rows, 2):
+        gap = cols - 1 if (r // 2) % 2 == 0 else 0
+        cells[r * cols:(r + 1) * cols] = b"\x01" * cols
+        cells[r * cols + gap] = 0
+    last = (rows - 1) // 2 * 2
+    goal = (last, cols - 1 if (last // 2) % 2 == 0 else 0)
+    return Grid.from_cells(cells, rows, cols), (0, 0), goal
+
+MAPS = {"random": random_map, "maze": maze, "rooms": rooms, "corridors": corridors, "serpentine": serpentine}
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import numpy as np
+from grid import *
+
+class NextHopOracle:
+    """
+    All-pairs next-hop table for one static obstacle layout.
+    table[goal, cell] = 1 + direction of the first step of a shortest path
+    from cell to goal (0 = unreachable, 5 = already there), both as flat
+    r * cols + c indices. One uint8 per pair, stored as a .npy file that is
+    memory-mapped on load, so every process sharing a level map shares it.
+    """
+    def __init__(self, grid, table):
+        self.grid = grid
+        self.table = table
+
+    @staticmethod
+    def key(grid):
+        # Identifies a layout: size + hash of the occupancy bytes
+        return f"{grid.rows}x{grid.cols}-{hashlib.sha1(bytes(grid.cells)).hexdigest()[:16]}"
+
+    @classmethod
+    def build(cls, grid, filename=None, chunk=256):
+        """
+        Runs a BFS from every free cell, chunk goals at a time as one
+        vectorized wavefront over a (chunk, rows, cols) array. With a
+        filename the table is written straight into a .npy memmap.
+        """
+        rows, cols = grid.rows, grid.cols
+        n = rows * cols
+        free = np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(rows, cols) == 0
+        if filename:
+            table = np.lib.format.open_memmap(filename, mode='w+', dtype=np.uint8, shape=(n, n))
+        else:
+            table = np.zeros((n, n), dtype=np.uint8)
+        goals = np.flatnonzero(free.ravel())
+        for lo in range(0, len(goals), chunk):
+            batch = goals[lo:lo + chunk]
+            m = len(batch)
+            hop = np.zeros((m, n), dtype=np.uint8)
+            hop[np.arange(m), batch] = 5
+            hop = hop.reshape(m, rows, cols)
+            frontier = hop != 0
+            reached = frontier.copy()
+            while frontier.any():
+                wave = np.zeros_like(frontier)
+                for k, (dr, dc) in enumerate(DIRECTIONS):
+                    # Cells entered by moving in direction k from the frontier:
+                    # their next hop back toward the goal is the opposite one
+                    moved = _shift(frontier, dr, dc) & free & ~reached
+                    hop[moved] = OPPOSITE[k] + 1
+                    reached |= moved
+                    wave |= moved
+                frontier = wave
+            table[batch] = hop.reshape(m, n)
+        if filename:
+            table.flush()
+        return cls(grid, table)
+
+    @classmethod
+    def load(cls, grid, filename):
+        return cls(grid, np.load(filename, mmap_mode='r'))
+
+    @classmethod
+    def cached(cls, grid, directory):
+        """
+        Loads the table of this layout from directory, building it on a miss.
+        """
+        filename = os.path.join(directory, f"nexthop-{cls.key(grid)}.npy")
+        if os.path.exists(filename):
+            return cls.load(grid, filename)
+        os.makedirs(directory, exist_ok=True)
+        # Build under a private name then rename, so concurrent builders never
+        # expose a half-written table
+        tmp = f"{filename}.{os.getpid()}.tmp.npy"
+        oracle = cls.build(grid, tmp)
+        del oracle.table
+        os.replace(tmp, filename)
+        return cls.load(grid, filename)
+
+    def next_move(self, pos, goal):
+        """
+        Returns the direction of the next step from pos to goal, None if
+        there is none (unreachable, or pos is the goal).
+        """
+        k = self.table[self.grid.index(goal), self.grid.index(pos)]
+        return DIRECTIONS[k - 1] if 0 < k < 5 else None
+
+    def path(self, start, goal):
+        row = self.table[self.grid.index(goal)]
+        offsets = self.grid.offsets
+        i = self.grid.index(start)
+        if not row[i]:
+            return []
+        path = []
+        while row[i] != 5:
+            k = row[i] - 1
+            path.append(DIRECTIONS[k])
+            i += offsets[k]
+        return path
+
+def _shift(a, dr, dc):
+    # out[:, r, c] = a[:, r - dr, c - dc], zero where that falls off the grid
+    out = np.zeros_like(a)
+    rows, cols = a.shape[1], a.shape[2]
+    out[:, max(dr, 0):rows + min(dr, 0), max(dc, 0):cols + min(dc, 0)] = \
+        a[:, max(-dr, 0):rows + min(-dr, 0), max(-dc, 0):cols + min(-dc, 0)]
+    return out
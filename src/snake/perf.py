@@ -1,95 +1,170 @@
+import argparse
 import csv
+import os
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Figures go to files, no display needed
 import matplotlib.pyplot as plt
+from results import *
 
-# Read the CSV file
-filename = 'scores.csv'
-times_goal_reached_1 = []
-times_goal_reached_2 = []
-avg_moves_1 = []
-avg_moves_2 = []
-avg_time_1 = []
-avg_time_2 = []
+# Performance analysis of the results store: weighted metric, averages and
+# 95% confidence intervals per (algorithm, level), vectorized with NumPy,
+# and one figure per metric written to files.
+# Usage: python perf.py [--results DIR] [--out DIR] [--weight 2] [--format png]
 
-# Read data from CSV
-with open(filename, newline='') as csvfile:
-    csvreader = csv.reader(csvfile)
-    #next(csvreader)  # Skip the header
-    for row in csvreader:
-        times_goal_reached_1.append(int(row[1]))
-        times_goal_reached_2.append(int(row[2]) if row[2] else 0)  # Handle empty case
-        avg_moves_1.append(float(row[3]))
-        avg_moves_2.append(float(row[4]) if row[4] else 0)  # Handle empty case
-        avg_time_1.append(float(row[5]))
-        avg_time_2.append(float(row[6]) if row[6] else 0)  # Handle empty case
+METRICS = {"weighted": "Weighted Metric of Success", "score": "Score",
+           "avg_moves": "Average Moves to Reach Goal", "avg_time": "Average Time to Reach Goal (seconds)"}
 
-# Default weight
-weight = 2
+def load(directory=RESULTS_DIR, where=None):
+    """
+    Returns the results as one structured array. The old scores.csv is
+    imported into an empty store first.
+    """
+    reader = ResultsReader(directory)
+    if not reader.files() and os.path.exists("scores.csv"):
+        import_csv("scores.csv", directory)
+    return reader.read(where)
 
-# Check if Player 2 has data (i.e., not all zeros or empty)
-player_2_has_data = any(val > 0 for val in times_goal_reached_2)
+def weighted_metric(data, weight=2):
+    """
+    Returns (metric of snake 1, metric of snake 2) per game: share of the food
+    eaten ** weight / average time per food. Alone, the share is 1 if the
+    snake ate anything. 0 wherever the ratio is undefined.
+    """
+    s1 = data["score1"].astype(np.float64)
+    s2 = data["score2"].astype(np.float64)
+    two = (data["algorithm2"] != "") | (s2 > 0)
+    total = np.where(two, s1 + s2, s1)
+    metrics = []
+    for score, avg_time in ((s1, data["avg_time1"]), (s2, data["avg_time2"])):
+        ok = (total > 0) & (score > 0) & (avg_time > 0)
+        share = np.divide(score, total, out=np.zeros_like(score), where=ok)
+        metrics.append(np.divide(share ** weight, avg_time, out=np.zeros_like(score), where=ok))
+    return metrics[0], metrics[1] * two
 
-# Calculate the weighted metric for player 1
-weighted_metric_1 = [
-    (times_goal_reached_1[i] / times_goal_reached_1[i])**weight / avg_time_1[i] if times_goal_reached_1[i] != 0 else 0
-    if not player_2_has_data else
-    (times_goal_reached_1[i] / (times_goal_reached_1[i] + times_goal_reached_2[i]))**weight / avg_time_1[i]
-    if (times_goal_reached_1[i] + times_goal_reached_2[i]) > 0 else 0  # Avoid division by zero
-    for i in range(len(times_goal_reached_1))
-]
+def per_snake(data, weight=2):
+    """
+    Long format: one entry per snake per game, with columns algorithm, level
+    and the METRICS. Snake 2 only counts in two player games.
+    """
+    w1, w2 = weighted_metric(data, weight)
+    two = data["algorithm2"] != ""
+    return {
+        "algorithm": np.concatenate([data["algorithm1"], data["algorithm2"][two]]),
+        "level": np.concatenate([data["level"], data["level"][two]]),
+        "weighted": np.concatenate([w1, w2[two]]),
+        "score": np.concatenate([data["score1"], data["score2"][two]]).astype(np.float64),
+        "avg_moves": np.concatenate([data["avg_moves1"], data["avg_moves2"][two]]),
+        "avg_time": np.concatenate([data["avg_time1"], data["avg_time2"][two]]),
+    }
 
-if player_2_has_data:
-    weighted_metric_2 = [
-        (times_goal_reached_2[i] / (times_goal_reached_1[i] + times_goal_reached_2[i]))**weight / avg_time_2[i] if times_goal_reached_2[i] != 0 else 0
-        if (times_goal_reached_1[i] + times_goal_reached_2[i]) > 0 else 0  # Avoid division by zero
-        for i in range(len(times_goal_reached_2))
-    ]
+def factorize(column):
+    """
+    Returns (sorted distinct values, code of every entry). Peels off one value
+    at a time, which beats sorting strings for the few algorithms and levels.
+    """
+    codes = np.empty(len(column), dtype=np.intp)
+    values = []
+    rest = np.arange(len(column))
+    while len(rest):
+        same = column[rest] == column[rest[0]]
+        codes[rest[same]] = len(values)
+        values.append(column[rest[0]])
+        rest = rest[~same]
+    order = np.argsort(values)
+    rank = np.empty(len(values), dtype=np.intp)
+    rank[order] = np.arange(len(values))
+    return [values[i] for i in order], rank[codes]
 
-# X-axis: iteration count (row index)
-iterations = list(range(1, len(times_goal_reached_1) + 1))
-if player_2_has_data:
-    iterations2 = list(range(1, len(times_goal_reached_2) + 1))
+def group_stats(columns, by=("algorithm", "level"), metrics=METRICS):
+    """
+    Vectorized group-by. Returns (group keys as a list of tuples, {metric:
+    (count, mean, std, 95% confidence half-width)} arrays in the same order).
+    """
+    # Combined group code of every row, over the product of the key values
+    inverse = np.zeros(len(columns[by[0]]), dtype=np.intp)
+    keys = [()]
+    for name in by:
+        values, codes = factorize(columns[name])
+        inverse = inverse * len(values) + codes
+        keys = [key + (value.item(),) for key in keys for value in values]
+    count = np.bincount(inverse, minlength=len(keys)).astype(np.float64)
+    present = np.flatnonzero(count)
+    remap = np.zeros(len(keys), dtype=np.intp)
+    remap[present] = np.arange(len(present))
+    inverse, count = remap[inverse], count[present]
+    result = {}
+    for metric in metrics:
+        values = columns[metric]
+        mean = np.bincount(inverse, weights=values, minlength=len(present)) / count
+        squares = np.bincount(inverse, weights=(values - mean[inverse]) ** 2, minlength=len(present))
+        std = np.sqrt(np.divide(squares, count - 1, out=np.zeros_like(count), where=count > 1))
+        # Normal approximation, for a handful of seeds it is on the narrow side
+        result[metric] = (count, mean, std, 1.96 * std / np.sqrt(count))
+    return [keys[i] for i in present], result
 
-# Plot the first graph for the weighted metric
-plt.plot(iterations, weighted_metric_1, label='Player 1 Weighted Metric', marker='o')
-if player_2_has_data:
-    plt.plot(iterations2, weighted_metric_2, label='Player 2 Weighted Metric', marker='o')
-plt.xlabel('Iteration (Row Number)')
-plt.ylabel('Weighted Metric for Player')
-plt.title('Weighted Metric of Success')
-plt.grid(True)
-plt.legend()
-plt.show()
+def plot(groups, result, out_dir, fmt="png"):
+    """
+    Writes one grouped bar chart (levels on x, one bar per algorithm, CI error
+    bars) per metric. Returns the file names.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    algorithms = sorted({a for a, _ in groups})
+    levels = sorted({l for _, l in groups})
+    index = {g: i for i, g in enumerate(groups)}
+    width = 0.8 / max(len(algorithms), 1)
+    x = np.arange(len(levels))
+    files = []
+    for metric, title in METRICS.items():
+        count, mean, std, ci = result[metric]
+        fig, ax = plt.subplots(figsize=(max(6, 1.5 * len(levels) + 2), 4.5))
+        for j, algorithm in enumerate(algorithms):
+            rows = [index.get((algorithm, level)) for level in levels]
+            heights = [mean[i] if i is not None else np.nan for i in rows]
+            errors = [ci[i] if i is not None else 0 for i in rows]
+            ax.bar(x + (j - (len(algorithms) - 1) / 2) * width, heights, width, yerr=errors,
+                   capsize=2, label=algorithm or "(unknown)")
+        ax.set_xticks(x)
+        ax.set_xticklabels(levels)
+        ax.set_xlabel("Level")
+        ax.set_ylabel(title)
+        ax.set_title(f"{title} (mean, 95% CI)")
+        ax.grid(True, axis="y")
+        ax.legend(fontsize="small")
+        fig.tight_layout()
+        filename = os.path.join(out_dir, f"{metric}.{fmt}")
+        fig.savefig(filename)
+        plt.close(fig)
+        files.append(filename)
+    return files
 
+def write_summary(filename, groups, result):
+    with open(filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["algorithm", "level", "games"] +
+                        [f"{m}_{s}" for m in METRICS for s in ("mean", "std", "ci95")])
+        for i, (algorithm, level) in enumerate(groups):
+            row = [algorithm, level, int(result["score"][0][i])]
+            for metric in METRICS:
+                row += [result[metric][1][i], result[metric][2][i], result[metric][3][i]]
+            writer.writerow(row)
 
-# Plot the second graph for average moves
-plt.plot(iterations, avg_moves_1, label='Player 1 Average Moves', marker='o')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyse the results store and plot per algorithm and level.")
+    parser.add_argument("--results", default=RESULTS_DIR, metavar="DIR", help="results store directory")
+    parser.add_argument("--out", default="figures", metavar="DIR", help="output directory for figures and summary.csv")
+    parser.add_argument("--weight", type=float, default=2, help="exponent of the food share in the weighted metric")
+    parser.add_argument("--format", default="png", help="figure file format (png, svg, pdf)")
+    args = parser.parse_args()
 
-if player_2_has_data:
-    plt.plot(iterations2, avg_moves_2, label='Player 2 Average Moves', marker='o')
-
-plt.xlabel('Iteration (Row Number)')
-plt.ylabel('Average Moves to Reach Goal')
-plt.title('Average Moves to Reach Goal')
-plt.grid(True)
-plt.legend()
-plt.show()
-
-plt.plot(iterations, avg_time_1, label='Player 1 Average Time', marker='o')
-if player_2_has_data:
-    plt.plot(iterations2, avg_time_2, label='Player 2 Average Time', marker='o')
-plt.xlabel('Iteration (Row Number)')
-plt.ylabel('Average Time to Reach Goal (seconds)')
-plt.title('Average Time to Reach Goal')
-plt.grid(True)
-plt.legend()
-plt.show()
-
-plt.plot(iterations, times_goal_reached_1, label='Player 1 Score', marker='o')
-if player_2_has_data:
-    plt.plot(iterations2, times_goal_reached_2, label='Player 2 Score', marker='o')
-plt.xlabel('Iteration (Row Number)')
-plt.ylabel('Score')
-plt.title('Scores')
-plt.grid(True)
-plt.legend()
-plt.show()
\ No newline at end of file
+    data = load(args.results)
+    if not len(data):
+        raise SystemExit(f"No results in {args.results}")
+    groups, result = group_stats(per_snake(data, args.weight))
+    files = plot(groups, result, args.out, args.format)
+    write_summary(os.path.join(args.out, "summary.csv"), groups, result)
+    for i, (algorithm, level) in enumerate(groups):
+        count, mean, _, ci = result["weighted"]
+        print(f"{algorithm or '(unknown)':>17} {level:>7}: {int(count[i]):>6} snakes, "
+              f"weighted {mean[i]:.3f} +- {ci[i]:.3f}, score {result['score'][1][i]:.2f}")
+    print(f"{len(data)} games, figures written to {', '.join(files)}")
@@ -0,0 +1,110 @@
+from collections import OrderedDict, deque
+from search_algorithms import *
+import stats
+from stats import instrumented
+
+class DistanceField:
+    """
+    Search tree grown backwards from one goal: toward[i] = 1 + direction of
+    the next step from cell i to the goal (0 = not reached yet). The BFS is
+    resumable, it only expands as far as the starts asked for so far, and
+    every later query for the same goal continues where it stopped.
+    """
+    __slots__ = ("grid", "goal", "toward", "queue")
+
+    def __init__(self, grid, goal):
+        self.grid, self.goal = grid, goal
+        self.toward = bytearray(grid.rows * grid.cols)
+        self.toward[goal] = 5
+        self.queue = deque([goal])
+
+    def reach(self, start):
+        """
+        Grows the tree until start is in it. Returns False if unreachable.
+        """
+        toward, queue = self.toward, self.queue
+        moves, offsets = self.grid.moves, self.grid.offsets
+        expanded = 0
+        while not toward[start] and queue:
+            cur = queue.popleft()
+            expanded += 1
+            for k in MASK_DIRS[moves[cur]]:
+                new = cur + offsets[k]
+                if not toward[new]:
+                    toward[new] = OPPOSITE[k] + 1
+                    queue.append(new)
+        stats.add("expanded", expanded)
+        return toward[start] != 0
+
+    def path(self, start):
+        if not self.reach(start):
+            return []
+        toward, offsets, goal = self.toward, self.grid.offsets, self.goal
+        path = []
+        i = start
+        while i != goal:
+            k = toward[i] - 1
+            path.append(DIRECTIONS[k])
+            i += offsets[k]
+        return path
+
+@instrumented
+def distance_field(field, start):
+    # Path from a DistanceField, recorded by stats like a search (the
+    # expansions are the ones this query added to the field)
+    return field.path(start)
+
+class Planner:
+    """
+    Search front end for one static grid that reuses earlier work:
+    a bounded LRU of recent (start, goal) -> path results and, for shortest
+    path algorithms (field=True), one resumable DistanceField per goal, so
+    replanning to a known goal from anywhere costs O(path length).
+    Goals outside the start's connected component are rejected in O(1).
+    budget (bfs, ucs and astar only) runs the memory-bounded search mode.
+    """
+    def __init__(self, grid, algorithm=bfs, cache_size=256, field=False, max_fields=8, budget=None):
+        self.grid = grid
+        self.algorithm = algorithm
+        self.budget = budget
+        # Label the components now, not inside the first search
+        grid.components()
+        self.cache_size = cache_size
+        self.field = field
+        self.max_fields = max_fields
+        self.paths = OrderedDict()
+        self.fields = OrderedDict()
+
+    def _field(self, goal):
+        i = self.grid.index(goal)
+        if i in self.fields:
+            self.fields.move_to_end(i)
+            return self.fields[i]
+        field = self.fields[i] = DistanceField(self.grid, i)
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def plan(self, start, goal):
+        """
+        Returns a fresh list of directions from start to goal ([] if none).
+        """
+        key = (start, goal)
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            return list(self.paths[key])
+        if not self.grid.connected(start, goal):
+            # e.g. food spawned in an enclosed pocket
+            path = []
+        elif self.field:
+            path = distance_field(self._field(goal), self.grid.index(start))
+        elif self.budget is not None:
+            path = self.algorithm(start, goal, self.grid, self.grid.rows, self.grid.cols, budget=self.budget)
+        else:
+            path = self.algorithm(start, goal, self.grid, self.grid.rows, self.grid.cols)
+        if self.cache_size:
+            self.paths[key] = path
+            if len(self.paths) > self.cache_size:
+                self.paths.popitem(last=False)
+            return list(path)
+        return path
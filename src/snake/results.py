@@ -0,0 +1,157 @@
+import csv
+import glob
+import os
+import time
+import uuid
+import numpy as np
+
+# Game results store: a directory of typed .npy chunks, one structured array
+# (a row per game) each. Writers buffer rows and flush them as a new chunk,
+# written under a private name and renamed into place, so any number of
+# processes can write to the same directory without locks and readers never
+# see a partial chunk. Readers stream chunk by chunk (memory-mapped).
+
+RESULTS_DIR = "results"
+
+# Row layout. Missing fields default to 0 ("" for strings, -1 for seed)
+DTYPE = np.dtype([
+    ("algorithm1", "U24"), ("algorithm2", "U24"), ("level", "U8"), ("seed", "i8"), ("turns", "i4"),
+    ("score1", "i4"), ("score2", "i4"),
+    ("avg_moves1", "f8"), ("avg_moves2", "f8"), ("avg_time1", "f8"), ("avg_time2", "f8"),
+    # Instrumentation: time spent planning, nodes expanded (stats.enable() only)
+    ("plan_time1", "f8"), ("plan_time2", "f8"), ("expanded1", "i8"), ("expanded2", "i8"),
+])
+
+def _row(record):
+    row = []
+    for name in DTYPE.names:
+        value = record.get(name)
+        if value is None:
+            value = -1 if name == "seed" else "" if DTYPE[name].kind == "U" else 0
+        row.append(value)
+    return tuple(row)
+
+class ResultsWriter:
+    """
+    Buffers result records (dicts) and flushes them in bulk as one chunk.
+    Use as a context manager, or call flush() before exiting.
+    """
+    def __init__(self, directory=RESULTS_DIR, buffer_size=4096):
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self.buffer = []
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, record):
+        self.buffer.append(_row(record))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        rows = np.array(self.buffer, dtype=DTYPE)
+        self.buffer = []
+        # Time first so chunks list in write order, pid + random part keep names unique
+        name = f"chunk-{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.npy"
+        tmp = os.path.join(self.directory, f".{name}.tmp")
+        with open(tmp, "wb") as file:
+            np.save(file, rows)
+        os.replace(tmp, os.path.join(self.directory, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+def _match(chunk, where):
+    # where: callable(chunk) -> bool mask, or {field: value or list of values}
+    if callable(where):
+        return where(chunk)
+    mask = np.ones(len(chunk), dtype=bool)
+    for field, value in where.items():
+        if isinstance(value, (list, tuple, set)):
+            mask &= np.isin(chunk[field], list(value))
+        else:
+            mask &= chunk[field] == value
+    return mask
+
+class ResultsReader:
+    """
+    Streams the chunks of a results directory, optionally filtered.
+    """
+    def __init__(self, directory=RESULTS_DIR):
+        self.directory = directory
+
+    def files(self):
+        return sorted(glob.glob(os.path.join(self.directory, "chunk-*.npy")))
+
+    def chunks(self, where=None):
+        """
+        Yields one structured array per chunk (only the rows matching where).
+        """
+        for filename in self.files():
+            chunk = np.load(filename, mmap_mode="r")
+            if where is not None:
+                chunk = chunk[_match(chunk, where)]
+            if len(chunk):
+                yield chunk
+
+    def read(self, where=None):
+        """
+        Returns all matching rows as one array (DTYPE).
+        """
+        chunks = list(self.chunks(where))
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=DTYPE)
+
+    def count(self, where=None):
+        return sum(len(chunk) for chunk in self.chunks(where))
+
+    def aggregate(self, by=("algorithm1", "level"), fields=("score1", "avg_moves1", "avg_time1"), where=None):
+        """
+        Group-by in one streaming pass. Returns {group key tuple: {"count": n,
+        field: mean, field + "_std": sample standard deviation}}.
+        """
+        totals = {}
+        for chunk in self.chunks(where):
+            keys = np.rec.fromarrays([np.asarray(chunk[name]) for name in by])
+            groups, inverse = np.unique(keys, return_inverse=True)
+            inverse = inverse.ravel()
+            counts = np.bincount(inverse, minlength=len(groups))
+            sums = [np.bincount(inverse, weights=chunk[f], minlength=len(groups)) for f in fields]
+            squares = [np.bincount(inverse, weights=np.square(chunk[f], dtype=np.float64), minlength=len(groups)) for f in fields]
+            for g, key in enumerate(groups):
+                entry = totals.setdefault(tuple(key.tolist()), [0, [0.0] * len(fields), [0.0] * len(fields)])
+                entry[0] += int(counts[g])
+                for j in range(len(fields)):
+                    entry[1][j] += sums[j][g]
+                    entry[2][j] += squares[j][g]
+        result = {}
+        for key, (n, sums, squares) in sorted(totals.items()):
+            row = {"count": n}
+            for f, s, sq in zip(fields, sums, squares):
+                mean = s / n
+                row[f] = float(mean)
+                row[f + "_std"] = float(np.sqrt(max(sq - n * mean * mean, 0.0) / (n - 1))) if n > 1 else 0.0
+            result[key] = row
+        return result
+
+def import_csv(filename="scores.csv", directory=RESULTS_DIR):
+    """
+    Copies the rows of the old headerless scores.csv (level, score1, score2,
+    avg_moves1, avg_moves2, avg_time1, avg_time2) into the store. Returns the
+    number of rows; their algorithm and seed are unknown (empty / -1).
+    """
+    fields = ["level", "score1", "score2", "avg_moves1", "avg_moves2", "avg_time1", "avg_time2"]
+    count = 0
+    with open(filename, newline="") as file, ResultsWriter(directory) as writer:
+        for row in csv.reader(file):
+            record = {f: (v if f == "level" else float(v) if v else None) for f, v in zip(fields, row)}
+            writer.append(record)
+            count += 1
+    return count
@@ -1,104 +1,198 @@
 import random
-from collections import deque
-from queue import PriorityQueue
 import math
-# Directions (Up, Down, Left, Right)
-DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+from array import array
+from grid import *
+from frontier import *
+import stats
+from stats import instrumented
 
 # Random movement algorithm (limited moves)
+@instrumented
 def random_move(start, goal, obstacles, rows, cols):
+    grid = as_grid(obstacles, rows, cols)
     path = []
-    current = start
+    current, target = grid.index(start), grid.index(goal)
     for _ in range(1000):  # Limit to 1000 moves
-        direction = random.choice(DIRECTIONS)
-        new_pos = (current[0] + direction[0], current[1] + direction[1])
-        if (
-            0 <= new_pos[0] < rows and 0 <= new_pos[1] < cols and
-            new_pos not in obstacles
-        ):
-            path.append(direction)
-            current = new_pos
-        if current == goal:
+        k = random.randrange(4)
+        if grid.moves[current] >> k & 1:
+            path.append(DIRECTIONS[k])
+            current += grid.offsets[k]
+        if current == target:
             return path
     return []
 
-def bfs(start, goal, obstacles, rows, cols):
-    q = deque([(start, [])]) # (position, path)
-    v = set([start])
-    while q is not None:
-        cur, path = q.popleft()
+def _unreachable(grid, start, goal):
+    # O(1) rejection, only on grids whose components were labelled when the
+    # layout was prepared (Grid.components(), e.g. by Planner): labelling
+    # here would charge a whole-map flood fill to one search
+    return grid.labels is not None and not grid.connected(start, goal)
+
+@instrumented
+def bfs(start, goal, obstacles, rows, cols, budget=None):
+    grid = as_grid(obstacles, rows, cols)
+    if _unreachable(grid, start, goal):
+        return []
+    moves, offsets = grid.moves, grid.offsets
+    start, goal = grid.index(start), grid.index(goal)
+    if budget is not None:
+        return _widening(_beam_bfs, grid, start, goal, budget)
+    q = stats.deque([start])
+    # Parent pointers: via[i] = 1 + direction used to reach i (0 = unvisited)
+    via = bytearray(rows * cols)
+    via[start] = 5
+    while q:
+        cur = q.popleft()
         # Path found
         if cur == goal:
-            return path
-        for dir in DIRECTIONS:
-            new = (cur[0] + dir[0], cur[1] + dir[1])
-            if (0 <= new[0] < rows and 0 <= new[1] < cols and
-                new not in obstacles and new not in v):
-                v.add(new)
-                q.append((new, path + [dir]))
+            return grid.trace(via, start, goal)
+        for k in MASK_DIRS[moves[cur]]:
+            new = cur + offsets[k]
+            if not via[new]:
+                via[new] = k + 1
+                q.append(new)
     # No path found
     return []
 
+@instrumented
 def dfs(start, goal, obstacles, rows, cols):
-    s = [(start, [])] # (position, path)
-    v = set([start])
-    while s is not None:
-        cur, path = s.pop()
+    grid = as_grid(obstacles, rows, cols)
+    moves, offsets = grid.moves, grid.offsets
+    start, goal = grid.index(start), grid.index(goal)
+    s = stats.stack([start])
+    via = bytearray(rows * cols)
+    via[start] = 5
+    while s:
+        cur = s.pop()
         # Path found
         if cur == goal:
-            return path
-        for dir in DIRECTIONS:
-            new = (cur[0] + dir[0], cur[1] + dir[1])
-            if (0 <= new[0] < rows and 0 <= new[1] < cols and
-                new not in obstacles and new not in v):
-                v.add(new)
-                s.append((new, path + [dir]))
+            return grid.trace(via, start, goal)
+        for k in MASK_DIRS[moves[cur]]:
+            new = cur + offsets[k]
+            if not via[new]:
+                via[new] = k + 1
+                s.append(new)
     # No path found
     return []
 
-# Recursive DLS for IDS (starts from start node):
-def dls(cur, goal, obstacles, rows, cols, depth, v, path):
-    # Path found
-    if cur == goal:
-        return path
-    if depth == 0:
-        return []
-    v.add(cur)
-    for dir in DIRECTIONS:
-        new = (cur[0] + dir[0], cur[1] + dir[1])
-        if (0 <= new[0] < rows and 0 <= new[1] < cols and new not in obstacles and new not in v):
-            m = dls(new, goal, obstacles, rows, cols, depth - 1, v, path + [dir])
-            if m != []:
-                return m
+# Depth/cost limited DFS shared by ids and ida_star, with an explicit stack
+# (no recursion limit). A cell is skipped if it is already on the current
+# path; with a best table (best g per cell in this iteration, one int per
+# grid cell) it is also skipped when reached before at no higher cost, which
+# stops the exponential re-expansion of transpositions. Only without the
+# table is memory linear in the depth.
+# Returns (path or None, smallest f = g + h above the limit, inf if none).
+# With a best table only cells never reached within the limit count towards
+# that f, so an exhausted component is detected in a single iteration.
+def dls(grid, start, goal, limit, h=None, best=None):
+    moves, offsets = grid.moves, grid.offsets
+    if start == goal:
+        return [], math.inf
+    on_path = bytearray(grid.rows * grid.cols)
+    on_path[start] = 1
+    stack = stats.stack([(start, 0, iter(MASK_DIRS[moves[start]]))])
+    path = []  # direction indices, one per stack entry after the first
+    cutoff = math.inf
+    cut = []
+    cutoffs = 0
+    while stack:
+        cur, g, children = stack[-1]
+        for k in children:
+            new = cur + offsets[k]
+            if on_path[new]:
+                continue
+            gnew = g + 1
+            if best is not None:
+                if best[new] <= gnew:
+                    continue
+                best[new] = gnew
+            f = gnew + h(new) if h else gnew
+            if f > limit:
+                cutoffs += 1
+                if best is None:
+                    cutoff = min(cutoff, f)
+                else:
+                    cut.append(new)
+                continue
+            # Path found
+            if new == goal:
+                stats.add("cutoffs", cutoffs)
+                return [DIRECTIONS[k] for k in path] + [DIRECTIONS[k]], cutoff
+            on_path[new] = 1
+            path.append(k)
+            stack.append((new, gnew, iter(MASK_DIRS[moves[new]])))
+            break
+        else:
+            # All children done, backtrack
+            stack.pop()
+            on_path[cur] = 0
+            if path:
+                path.pop()
     # No path found
-    return []
+    stats.add("cutoffs", cutoffs)
+    for c in cut:
+        f = best[c] + h(c) if h else best[c]
+        if f > limit:
+            cutoff = min(cutoff, f)
+    return None, cutoff
+
+# Iterative deepening (ids, ida_star) trades time for memory: every iteration
+# is a new depth-first pass over all cells within the limit, and the limit
+# only grows to the next depth (or f) that was cut off. Where the shortest
+# path is much longer than the Manhattan distance (mazes, corridors) that is
+# thousands of passes: on 200x200 maze and corridors maps one search takes
+# about a minute (ida* ~50 s, ids ~70 s), where bfs takes 10 ms.
+# The transposition table (transpositions=True, the default) keeps each pass
+# linear in the cells reached, but costs two ints per grid cell (the table
+# and its reset copy); transpositions=False keeps memory linear in the depth,
+# at exponential time on anything but small open grids.
+def _transposition_table(rows, cols, transpositions):
+    # (table, template to reset it from) or (None, None)
+    if not transpositions:
+        return None, None
+    unreached = array('i', [rows * cols]) * (rows * cols)
+    return array('i', unreached), unreached
 
-def ids(start, goal, obstacles, rows, cols):
-    depth = 0
+@instrumented
+def ids(start, goal, obstacles, rows, cols, transpositions=True):
+    grid = as_grid(obstacles, rows, cols)
+    # No path is shorter than the Manhattan distance, start deepening there
+    depth = manhattan_distance(start, goal)
+    start, goal = grid.index(start), grid.index(goal)
+    best, unreached = _transposition_table(rows, cols, transpositions)
     while True:
-        v = set()
-        m = dls(start, goal, obstacles, rows, cols, depth, v, [])
-        if m != []:
-            return m
+        if best is not None:
+            best[:] = unreached
+        path, cutoff = dls(grid, start, goal, depth, best=best)
+        if path is not None:
+            return path
+        # Nothing was cut off by the depth limit: goal unreachable
+        if cutoff == math.inf:
+            return []
         depth += 1
 
-def ucs(start, goal, obstacles, rows, cols):
-    pq = PriorityQueue()
-    pq.put((0, start, [])) # (cost, pos, path)
-    v = {}
-    while not pq.empty():
-        cost, cur, path = pq.get()
+@instrumented
+def ucs(start, goal, obstacles, rows, cols, budget=None):
+    grid = as_grid(obstacles, rows, cols)
+    if _unreachable(grid, start, goal):
+        return []
+    moves, offsets = grid.moves, grid.offsets
+    start, goal = grid.index(start), grid.index(goal)
+    if budget is not None:
+        return _widening(_bounded_best_first, grid, start, goal, budget, lambda i: 0)
+    # Frontier of (cost, index, direction used to get there), it keeps the
+    # best cost per cell so cheaper or equal cost paths are never requeued
+    pq = stats.Frontier()
+    pq.push(start, 0, 4)
+    # Parent pointers, set when a node is expanded (its direction may improve while queued)
+    via = bytearray(rows * cols)
+    while pq:
+        cost, cur, k = pq.pop()
+        via[cur] = k + 1
         # Path found
         if cur == goal:
-            return path
-        # Skip if cheaper or equal cost path found
-        if cur in v and v[cur] <= cost:
-            continue
-        v[cur] = cost
-        for dir in DIRECTIONS:
-            new = (cur[0] + dir[0], cur[1] + dir[1])
-            if (0 <= new[0] < rows and 0 <= new[1] < cols and new not in obstacles):
-                pq.put((cost + 1, new, path + [dir]))
+            return grid.trace(via, start, goal)
+        for k in MASK_DIRS[moves[cur]]:
+            pq.push(cur + offsets[k], cost + 1, k)
     # No path found
     return []
 
@@ -107,22 +201,25 @@ def manhattan_distance(a, b):
     # |x1 - y1| + |x2 - y2|
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+@instrumented
 def greedy_bfs(start, goal, obstacles, rows, cols):
-    pq = PriorityQueue()
-    pq.put((manhattan_distance(start, goal), start, [])) # ()
-    v = set()
-    while not pq.empty():
-        f, cur, path = pq.get()
+    grid = as_grid(obstacles, rows, cols)
+    moves, offsets = grid.moves, grid.offsets
+    target = goal
+    start, goal = grid.index(start), grid.index(goal)
+    pq = stats.Frontier() # (h, index, direction), each cell is queued once
+    pq.push(start, manhattan_distance(grid.pos(start), target), 4)
+    via = bytearray(rows * cols)
+    while pq:
+        f, cur, k = pq.pop()
+        via[cur] = k + 1
         # Path found
         if cur == goal:
-            return path
-        if cur in v:
-            continue
-        v.add(cur)
-        for dir in DIRECTIONS:
-            new = (cur[0] + dir[0], cur[1] + dir[1])
-            if (0 <= new[0] < rows and 0 <= new[1] < cols and new not in obstacles and new not in v):
-                pq.put((manhattan_distance(new, goal), new, path + [dir]))
+            return grid.trace(via, start, goal)
+        for k in MASK_DIRS[moves[cur]]:
+            new = cur + offsets[k]
+            if not via[new]:
+                pq.push(new, manhattan_distance(grid.pos(new), target), k)
     # No path found
     return []
 
@@ -141,25 +238,258 @@ def weighted_euclidean(pos, goal, weight=5):
     dx, dy = abs(pos[0] - goal[0]), abs(pos[1] - goal[1])
     return weight * math.sqrt(dx ** 2 + dy ** 2)
 
-def astar(start, goal, obstacles, rows, cols, heuristic=weighted_euclidean):
-    pq = PriorityQueue()
-    pq.put((0, 0, start, []))  # (Heuristic, Cost, Position, Path)
-    v = {}
-    while not pq.empty():
-        f, g, cur, path = pq.get()
+@instrumented
+def astar(start, goal, obstacles, rows, cols, heuristic=weighted_euclidean, budget=None):
+    grid = as_grid(obstacles, rows, cols)
+    if _unreachable(grid, start, goal):
+        return []
+    moves, offsets = grid.moves, grid.offsets
+    target = goal
+    start, goal = grid.index(start), grid.index(goal)
+    if budget is not None:
+        return _widening(_bounded_best_first, grid, start, goal, budget, lambda i: heuristic(grid.pos(i), target))
+    # (f = cost + heuristic, index, (cost, direction)). h is fixed per cell, so
+    # a lower f is a cheaper path: the frontier reopens cells only then
+    pq = stats.Frontier()
+    pq.push(start, 0, (0, 4))
+    via = bytearray(rows * cols)
+    while pq:
+        f, cur, (g, k) = pq.pop()
+        via[cur] = k + 1
         # Path found
         if cur == goal:
+            return grid.trace(via, start, goal)
+        gnew = g + 1
+        for k in MASK_DIRS[moves[cur]]:
+            new = cur + offsets[k]
+            pq.push(new, gnew + heuristic(grid.pos(new), target), (gnew, k))
+    # No path found
+    return []
+
+# Memory-bounded mode of bfs, ucs and astar (budget = frontier entries kept):
+# bfs keeps a beam of the budget cells closest to the goal per layer, ucs and
+# astar forget their worst frontier entries (SMA*-style) when over budget and
+# never reopen a cell. If the budget runs out before the goal is found, the
+# path to the cell that got closest to the goal is returned, so the snake
+# makes progress and replans from there; if no cell got closer, the search is
+# retried with twice the budget (up to the grid size: the unbounded search).
+
+# Rough bytes per frontier entry (heap tuple and its dict slot), see frontier_budget
+FRONTIER_ENTRY_BYTES = 200
+
+def frontier_budget(max_bytes):
+    """
+    Frontier entries fitting in max_bytes, the budget for a byte limit.
+    """
+    return max(2, max_bytes // FRONTIER_ENTRY_BYTES)
+
+def _widening(search, grid, start, goal, budget, *args):
+    cells = grid.rows * grid.cols
+    while True:
+        path, found = search(grid, start, goal, budget, *args)
+        if found or path or budget >= cells:
+            return path
+        budget *= 2
+
+def _distance_to(grid, goal):
+    # Manhattan distance to goal by cell index
+    cols = grid.cols
+    gr, gc = divmod(goal, cols)
+    def distance(i):
+        r, c = divmod(i, cols)
+        return abs(r - gr) + abs(c - gc)
+    return distance
+
+def _beam_bfs(grid, start, goal, budget):
+    # Returns (path, found)
+    moves, offsets = grid.moves, grid.offsets
+    distance = _distance_to(grid, goal)
+    via = bytearray(grid.rows * grid.cols)
+    via[start] = 5
+    closest, best = start, distance(start)
+    layer = stats.stack()
+    layer.append(start)
+    while layer:
+        nxt = stats.stack()
+        while layer:
+            cur = layer.pop()
+            if cur == goal:
+                return grid.trace(via, start, goal), True
+            d = distance(cur)
+            if d < best:
+                closest, best = cur, d
+            for k in MASK_DIRS[moves[cur]]:
+                new = cur + offsets[k]
+                if not via[new]:
+                    via[new] = k + 1
+                    nxt.append(new)
+        if len(nxt) > budget:
+            nxt.sort(key=distance)
+            stats.add("cutoffs", len(nxt) - budget)
+            del nxt[budget:]
+        layer = nxt
+    return grid.trace(via, start, closest), False
+
+def _bounded_best_first(grid, start, goal, budget, h):
+    # Returns (path, found), f = cost + h(cell)
+    moves, offsets = grid.moves, grid.offsets
+    distance = _distance_to(grid, goal)
+    pq = stats.Frontier()
+    pq.push(start, h(start), (0, 4))
+    via = bytearray(grid.rows * grid.cols)
+    closest, best = start, distance(start)
+    while pq:
+        f, cur, (g, k) = pq.pop()
+        via[cur] = k + 1
+        # Closed cells are in via, the frontier only needs to know the queued ones
+        pq.forget(cur)
+        if cur == goal:
+            return grid.trace(via, start, goal), True
+        d = distance(cur)
+        if d < best:
+            closest, best = cur, d
+        gnew = g + 1
+        for k in MASK_DIRS[moves[cur]]:
+            new = cur + offsets[k]
+            if not via[new]:
+                pq.push(new, gnew + h(new), (gnew, k))
+        if len(pq) > budget:
+            # Down to half, so the sort is paid once per budget / 2 pushes
+            stats.add("cutoffs", pq.shrink(budget // 2))
+    return grid.trace(via, start, closest), False
+
+@instrumented
+def bidirectional_bfs(start, goal, obstacles, rows, cols):
+    grid = as_grid(obstacles, rows, cols)
+    moves, offsets = grid.moves, grid.offsets
+    start, goal = grid.index(start), grid.index(goal)
+    if start == goal:
+        return []
+    # Side 0 grows from start (via = direction used to enter a cell), side 1
+    # grows from goal (via = direction of the next step toward the goal).
+    # Saves the most with both ends in open space: two balls of half the
+    # radius. Between opposite corners the two halves still cover the map, as
+    # bfs does (300x300 at 5% obstacles: 84,798 cells expanded, bfs 85,501)
+    via = (bytearray(rows * cols), bytearray(rows * cols))
+    via[0][start], via[1][goal] = 5, 5
+    layers = [[start], [goal]]
+    while layers[0] and layers[1]:
+        # Expand one full layer of the smaller side. Expanding layer by layer,
+        # the first cell both sides reach lies on a shortest path: any cell
+        # the other side reached earlier has all its neighbours reached too
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        mine, other = via[side], via[1 - side]
+        stats.add("expanded", len(layers[side]))
+        layer = stats.stack()
+        for cur in layers[side]:
+            for k in MASK_DIRS[moves[cur]]:
+                new = cur + offsets[k]
+                if mine[new]:
+                    continue
+                mine[new] = k + 1 if side == 0 else OPPOSITE[k] + 1
+                if other[new]:
+                    path = grid.trace(via[0], start, new)
+                    i = new
+                    while i != goal:
+                        k = via[1][i] - 1
+                        path.append(DIRECTIONS[k])
+                        i += offsets[k]
+                    return path
+                layer.append(new)
+        layers[side] = layer
+    # No path found
+    return []
+
+# Jump Point Search for 4-connected grids. Canonical shortest paths move
+# horizontally first: after a horizontal step every turn is allowed, after a
+# vertical step only straight on, unless a side cell just opened up (forced).
+# Horizontal jumps stop where a vertical jump finds something.
+def _jump_vertical(i, k, goal, moves, offsets):
+    while moves[i] >> k & 1:
+        p, i = i, i + offsets[k]
+        # Goal, or a left/right neighbour that was blocked one step back
+        if i == goal or moves[i] & 12 & ~moves[p]:
+            return i
+    return None
+
+def _jump_horizontal(i, k, goal, moves, offsets):
+    while moves[i] >> k & 1:
+        i += offsets[k]
+        if (i == goal or _jump_vertical(i, 0, goal, moves, offsets) is not None or
+            _jump_vertical(i, 1, goal, moves, offsets) is not None):
+            return i
+    return None
+
+@instrumented
+def jps(start, goal, obstacles, rows, cols):
+    grid = as_grid(obstacles, rows, cols)
+    moves, offsets = grid.moves, grid.offsets
+    target = goal
+    start, goal = grid.index(start), grid.index(goal)
+    # Nodes are (cell, arrival direction) keys cell * 5 + k, k = 4 at the start,
+    # since the successors of a jump point depend on how it was reached
+    # Priority f * n - g: among equal f the deepest node first. Manhattan
+    # distance is exact on open ground, so without this every jump point on
+    # the plateau of equal f (most of a sparse map) would be popped in FIFO order
+    n = rows * cols
+    pq = stats.Frontier()
+    pq.push(start * 5 + 4, manhattan_distance(grid.pos(start), target) * n, (0, None))
+    parent = {}
+    while pq:
+        f, node, (g, prev) = pq.pop()
+        parent[node] = prev
+        cur, arrived = divmod(node, 5)
+        # Path found: expand the straight segments between jump points
+        if cur == goal:
+            cells = []
+            while node is not None:
+                cells.append(node // 5)
+                node = parent[node]
+            cells.reverse()
+            path = []
+            for a, b in zip(cells, cells[1:]):
+                (ra, ca), (rb, cb) = grid.pos(a), grid.pos(b)
+                if ra != rb:
+                    path += [DIRECTIONS[0 if rb < ra else 1]] * abs(rb - ra)
+                else:
+                    path += [DIRECTIONS[2 if cb < ca else 3]] * abs(cb - ca)
             return path
-        # Skip if cheaper or equal cost path found
-        if cur in v and v[cur] <= g:
-            continue
-        v[cur] = g
-        for dir in DIRECTIONS:
-            new = (cur[0] + dir[0], cur[1] + dir[1])
-            if (0 <= new[0] < rows and 0 <= new[1] < cols and
-                new not in obstacles):
-                gnew = g + 1
-                f = gnew + heuristic(new, goal)
-                pq.put((f, gnew, new, path + [dir]))
+        if arrived == 4 or arrived >= 2:
+            dirs = (0, 1, 2, 3) if arrived == 4 else (0, 1, arrived)
+        else:
+            # Vertical arrival: straight on, plus the forced sides
+            back = moves[cur - offsets[arrived]]
+            dirs = (arrived,) + tuple(k for k in (2, 3) if moves[cur] >> k & 1 and not back >> k & 1)
+        for k in dirs:
+            if k < 2:
+                jump = _jump_vertical(cur, k, goal, moves, offsets)
+            else:
+                jump = _jump_horizontal(cur, k, goal, moves, offsets)
+            if jump is None:
+                continue
+            gnew = g + abs(jump - cur) // (cols if k < 2 else 1)
+            pq.push(jump * 5 + k, (gnew + manhattan_distance(grid.pos(jump), target)) * n - gnew, (gnew, node))
     # No path found
-    return []
\ No newline at end of file
+    return []
+
+# IDA*: iterative deepening on f = g + heuristic, the next bound is the
+# smallest f that exceeded the previous one (optimal with an admissible
+# heuristic such as manhattan_distance or euclidean_distance)
+@instrumented
+def ida_star(start, goal, obstacles, rows, cols, heuristic=manhattan_distance, transpositions=True):
+    grid = as_grid(obstacles, rows, cols)
+    target = goal
+    h = lambda i: heuristic(grid.pos(i), target)
+    start, goal = grid.index(start), grid.index(goal)
+    bound = math.ceil(h(start))
+    best, unreached = _transposition_table(rows, cols, transpositions)
+    while True:
+        if best is not None:
+            best[:] = unreached
+        path, cutoff = dls(grid, start, goal, bound, h, best)
+        if path is not None:
+            return path
+        if cutoff == math.inf:
+            return []
+        # Path costs are whole steps, so a fractional bound can be rounded up
+        bound = math.ceil(cutoff)
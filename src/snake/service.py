@@ -0,0 +1,181 @@
+import multiprocessing
+import threading
+import concurrent.futures
+from concurrent.futures import Future
+from search_algorithms import *
+from planner import Planner
+
+# Asynchronous planning for the pygame front end: searches run in a worker
+# process per snake (so two snakes search in parallel and the game loop never
+# waits on one), requests come back as concurrent.futures.Future objects.
+
+def _serve(conn, grid, algorithm, options):
+    # Worker process: one Planner, so its caches persist between requests.
+    # Replies carry the ticket of their request
+    planner = Planner(grid, algorithm, **options)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        ticket, start, goal = request
+        conn.send((ticket, planner.plan(start, goal)))
+
+class SearchWorker:
+    """
+    One search process, one request awaited at a time. cancel() does not
+    stop the worker: the search runs to the end and its reply is dropped, so
+    the Planner and its caches live as long as the worker. A request made
+    meanwhile is served after it. If the worker dies, the awaited future
+    gets the error.
+    """
+    def __init__(self, grid, algorithm, **planner_options):
+        self.args = (grid, algorithm, planner_options)
+        self.lock = threading.Lock()
+        self.ticket = 0      # ticket of the latest request
+        self.answered = 0    # ticket of the latest reply
+        self.future = None   # future of the latest request, None once cancelled
+        self.closing = False
+        self.error = None    # why the worker stopped answering, once it has
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(child,) + self.args, daemon=True)
+        self.process.start()
+        child.close()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        # Reader thread: resolves the future of the current request, drops
+        # the replies to cancelled ones
+        while True:
+            try:
+                ticket, path = self.conn.recv()
+            except (EOFError, OSError) as error:
+                with self.lock:
+                    if self.closing:
+                        return
+                    self.error = RuntimeError(f"search worker exited ({error!r})")
+                    future, self.future = self.future, None
+                    if future is not None and future.set_running_or_notify_cancel():
+                        future.set_exception(self.error)
+                return
+            with self.lock:
+                self.answered = ticket
+                if ticket != self.ticket or self.future is None:
+                    continue
+                future, self.future = self.future, None
+                if future.set_running_or_notify_cancel():
+                    future.set_result(path)
+
+    def submit(self, start, goal):
+        """
+        Starts a search, returns a Future of its path.
+        """
+        with self.lock:
+            if self.error is not None:
+                raise self.error
+            if self.future is not None:
+                raise RuntimeError("a search is already running, cancel it first")
+            self.ticket += 1
+            self.future = future = Future()
+            self.conn.send((self.ticket, start, goal))
+        return future
+
+    def cancel(self):
+        with self.lock:
+            future, self.future = self.future, None
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        if self.process is None:
+            return
+        self.cancel()
+        with self.lock:
+            self.closing = True
+            busy = self.answered != self.ticket
+        if busy:
+            # Nobody waits for the search in flight
+            self.process.terminate()
+        else:
+            self.conn.send(None)
+        self.process.join()
+        self.conn.close()
+        self.process = None
+
+def fallback_move(grid, pos, goal):
+    """
+    Direction of a free neighbour closer (Manhattan) to goal, None if none is.
+    """
+    i, best = grid.index(pos), manhattan_distance(pos, goal)
+    move = None
+    for k in MASK_DIRS[grid.moves[i]]:
+        dr, dc = DIRECTIONS[k]
+        d = manhattan_distance((pos[0] + dr, pos[1] + dc), goal)
+        if d < best:
+            best, move = d, DIRECTIONS[k]
+    return move
+
+class AsyncPlanner:
+    """
+    Per-snake planning on a SearchWorker, asked for one move per turn.
+    While the search runs the snake takes fallback moves (greedy toward the
+    goal); when the plan arrives it is joined to where the snake went
+    meanwhile. A goal change cancels the search in flight.
+    """
+    def __init__(self, worker, grid, wait=0.005, fallback=fallback_move):
+        self.worker, self.grid = worker, grid
+        self.wait = wait  # seconds a move may wait for a fresh plan before falling back
+        self.fallback = fallback
+        self.goal = None
+        self.path = []
+        self.future = None
+        self.trail = []  # positions since the plan was requested, request start first
+
+    def next_move(self, pos, goal):
+        """
+        Returns the direction of the snake's next move, None to stay.
+        """
+        if goal != self.goal:
+            self.worker.cancel()
+            self.future, self.goal, self.path = None, goal, []
+        if self.path:
+            return self.path.pop(0)
+        if pos == goal:
+            return None
+        if self.future is None:
+            self.future = self.worker.submit(pos, goal)
+            self.trail = [pos]
+        try:
+            plan = self.future.result(timeout=self.wait)
+        except concurrent.futures.TimeoutError:
+            move = self.fallback(self.grid, pos, goal)
+            if move is not None:
+                self.trail.append((pos[0] + move[0], pos[1] + move[1]))
+            return move
+        self.future = None
+        self.path = self._join(plan)
+        return self.path.pop(0) if self.path else None
+
+    def _join(self, plan):
+        if not plan:
+            return []
+        # Cells of the plan, from the request start
+        cells = {self.trail[0]: 0}
+        r, c = self.trail[0]
+        for i, (dr, dc) in enumerate(plan):
+            r, c = r + dr, c + dc
+            cells.setdefault((r, c), i + 1)
+        # Walk the fallback trail back to the latest cell on the plan
+        back = []
+        for t in range(len(self.trail) - 1, -1, -1):
+            cell = self.trail[t]
+            if cell in cells:
+                return back + plan[cells[cell]:]
+            prev = self.trail[t - 1]
+            back.append((prev[0] - cell[0], prev[1] - cell[1]))
+        return []
+
+    def close(self):
+        self.worker.close()
@@ -0,0 +1,247 @@
+import random
+import time
+from search_algorithms import *
+import stats
+from planner import *
+from oracle import *
+from results import *
+from service import *
+
+# Levels: % of the grid covered by obstacles
+LEVELS = {"level0": 0, "level1": 5, "level2": 10, "level3": 15}
+
+ALGORITHMS = {"bfs": bfs, "dfs": dfs, "ucs": ucs, "ids": ids, "a*": astar, "random": random_move, "greedy_bfs": greedy_bfs,
+              "bidirectional_bfs": bidirectional_bfs, "jps": jps, "ida*": ida_star}
+
+# Algorithms that always return a shortest path: with reuse on, replanned from
+# a shared distance field (or the next-hop oracle) instead of their own search
+SHORTEST = {"bfs", "ucs"}
+# random_move must not be cached, every call is a new random walk
+UNCACHED = {"random"}
+
+# Grid settings (same board as the pygame front end: 500px / 20px cells)
+ROWS, COLS = 25, 25
+
+# Turn budget replacing the wall-clock TIME_LIMIT (30s at 10 FPS)
+MAX_TURNS = 300
+
+def planner_options(algorithm, reuse=False):
+    # Planner settings per algorithm (see SHORTEST and UNCACHED). Without
+    # reuse every plan runs the algorithm's own search, so algorithms compare
+    if not reuse:
+        return {"cache_size": 0}
+    return {"cache_size": 0 if algorithm in UNCACHED else 256, "field": algorithm in SHORTEST}
+
+class SnakeSimulation:
+    """
+    Headless snake game: grid, obstacles, food, one or two AI snakes and the
+    evaluation metrics. Steps as fast as the searches allow, no pygame needed.
+    reuse=True lets the planners reuse earlier work (path cache, distance
+    fields and, with oracle_dir, the next-hop oracle for bfs and ucs): faster,
+    but bfs and ucs then play the same shared BFS. oracle_dir implies reuse.
+    """
+    def __init__(self, level, algorithm1, algorithm2=None, rows=ROWS, cols=COLS, max_turns=MAX_TURNS, seed=None, oracle_dir=None, asynchronous=False, reuse=False):
+        if level not in LEVELS:
+            raise ValueError(f"Invalid level: {level}")
+        for algorithm in (algorithm1, algorithm2):
+            if algorithm is not None and algorithm not in ALGORITHMS:
+                raise ValueError(f"Invalid search algorithm: {algorithm}")
+        self.level = level
+        self.algorithm1 = algorithm1
+        self.algorithm2 = algorithm2
+        self.two_players = algorithm2 is not None
+        self.rows, self.cols = rows, cols
+        self.max_turns = max_turns
+        self.seed = seed
+        self.reuse = reuse or oracle_dir is not None
+        self.rng = random.Random(seed)
+
+        # AI Snakes' starting position
+        self.snake1_pos = [rows // 4, cols // 4]
+        self.snake2_pos = [rows - rows // 4, cols - cols // 4] if self.two_players else None
+
+        self.score1 = 0
+        self.score2 = 0 if self.two_players else None
+
+        # Generate obstacles based on level
+        self.obstacles = set()
+        obstacle_count = (rows * cols * LEVELS[level]) // 100 # % of total grid size
+        while len(self.obstacles) < obstacle_count:
+            obstacle = (self.rng.randint(0, rows - 1), self.rng.randint(0, cols - 1))
+            if obstacle not in (tuple(self.snake1_pos), tuple(self.snake2_pos or [])):
+                self.obstacles.add(obstacle)
+        # Obstacles never move, so the searches share one array-backed grid
+        self.grid = Grid(self.obstacles, rows, cols)
+        # One planner per algorithm, so with reuse a snake reuses the search
+        # work done for the same goal (by itself or by the other snake)
+        self.planners = {}
+        for algorithm in (algorithm1, algorithm2):
+            if algorithm is not None and algorithm not in self.planners:
+                self.planners[algorithm] = Planner(self.grid, ALGORITHMS[algorithm], **planner_options(algorithm, self.reuse))
+        # Asynchronous planning (pygame front end): a search process per snake,
+        # fallback moves while a plan is pending. Timing dependent, so off headless
+        self.async_planners = None
+        if asynchronous:
+            self.async_planners = [AsyncPlanner(SearchWorker(self.grid, ALGORITHMS[a], **planner_options(a, self.reuse)), self.grid)
+                                   for a in (algorithm1, algorithm2) if a is not None]
+        # Optional precomputation: all-pairs next hops of this layout, shared
+        # through a memory-mapped file by every run on the same map
+        self.oracle = NextHopOracle.cached(self.grid, oracle_dir) if oracle_dir else None
+
+        # Metric for evaluation
+        self.moves1 = 0
+        self.moves2 = 0
+        self.food_times = {}
+        self.times1 = {}
+        self.times2 = {}
+        self.food_num = 0
+        self.moves_per_goal1 = []
+        self.moves_per_goal2 = []
+        # Instrumentation: planning time, and expansions while stats is enabled
+        self.plan_time = [0.0, 0.0]
+        self.expanded = [0, 0]
+
+        self.turn = 0
+        self.running = True
+        self.path1, self.path2 = [], []
+
+        self.food_pos = self.generate_food()
+        self.food_num += 1
+        self.food_times[self.food_num] = time.time()
+
+    # Check if new food position is valid (not an obstacle or a snake)
+    def generate_food(self):
+        while True:
+            new_food = (self.rng.randint(0, self.rows - 1), self.rng.randint(0, self.cols - 1))
+            if (new_food not in self.obstacles and new_food != tuple(self.snake1_pos) and
+                (not self.two_players or new_food != tuple(self.snake2_pos))):
+                return list(new_food)
+
+    def plan(self, algorithm, pos, player=1):
+        t = time.perf_counter()
+        seen = len(stats.records)
+        if self.oracle is not None and algorithm in SHORTEST:
+            path = self.oracle.path(tuple(pos), tuple(self.food_pos))
+        else:
+            path = self.planners[algorithm].plan(tuple(pos), tuple(self.food_pos))
+        self.plan_time[player - 1] += time.perf_counter() - t
+        # Searches recorded by stats during this plan (none while disabled),
+        # taken off the list so long games and tournaments do not grow it
+        self.expanded[player - 1] += sum(r["expanded"] for r in stats.records[seen:])
+        del stats.records[seen:]
+        return path
+
+    def step(self):
+        """
+        Advances the game by one turn. Returns False once the game is over.
+        """
+        if not self.running:
+            return False
+        # Turn budget exhausted
+        if self.max_turns is not None and self.turn >= self.max_turns:
+            self.running = False
+            return False
+        self.turn += 1
+
+        move1 = move2 = None
+        if self.async_planners:
+            food = tuple(self.food_pos)
+            move1 = self.async_planners[0].next_move(tuple(self.snake1_pos), food)
+            if self.two_players:
+                move2 = self.async_planners[1].next_move(tuple(self.snake2_pos), food)
+        else:
+            if not self.path1:
+                self.path1 = self.plan(self.algorithm1, self.snake1_pos)
+            if self.two_players and not self.path2:
+                self.path2 = self.plan(self.algorithm2, self.snake2_pos, player=2)
+            if self.path1:
+                move1 = self.path1.pop(0)
+            if self.two_players and self.path2:
+                move2 = self.path2.pop(0)
+
+        # Move AI Snakes
+        if move1:
+            self.moves1 += 1
+            self.snake1_pos[0] += move1[0]
+            self.snake1_pos[1] += move1[1]
+        if move2:
+            self.moves2 += 1
+            self.snake2_pos[0] += move2[0]
+            self.snake2_pos[1] += move2[1]
+
+        # Check if AI hits an obstacle (Game Over)
+        if tuple(self.snake1_pos) in self.obstacles or (self.two_players and tuple(self.snake2_pos) in self.obstacles):
+            self.running = False
+            return False
+
+        # Check if AI reaches food (Increase Score, Relocate Food)
+        if self.snake1_pos == self.food_pos and (not self.two_players or self.snake2_pos != self.food_pos):
+            self.score1 += 1
+            self._eat(player1=True)
+        if self.two_players and self.snake2_pos == self.food_pos and self.snake1_pos != self.food_pos:
+            self.score2 += 1
+            self._eat(player2=True)
+        # Case: When both snakes' paths coincide and reach the food at the same time
+        # In that case, both receive the point
+        if self.two_players and self.snake1_pos == self.snake2_pos == self.food_pos:
+            self.score1 += 1
+            self.score2 += 1
+            self._eat(player1=True, player2=True)
+        return True
+
+    def _eat(self, player1=False, player2=False):
+        # Metrics for evaluation + relocate food, every snake must replan
+        self.food_num += 1
+        self.food_times[self.food_num] = time.time()
+        if player1:
+            self.times1[self.food_num] = time.time() - self.food_times[self.food_num - 1]
+            if self.food_num > 1:
+                self.moves_per_goal1.append(self.moves1)  # Store moves used to reach the goal
+            self.moves1 = 0
+        if player2:
+            self.times2[self.food_num] = time.time() - self.food_times[self.food_num - 1]
+            if self.food_num > 1:
+                self.moves_per_goal2.append(self.moves2)
+            self.moves2 = 0
+        self.food_pos = self.generate_food()
+        self.path1 = []
+        self.path2 = []
+
+    def close(self):
+        # Stops the search processes of asynchronous planning
+        for planner in self.async_planners or ():
+            planner.close()
+        self.async_planners = None
+
+    def run(self):
+        """
+        Plays the game until the turn budget runs out, returns the results.
+        """
+        while self.step():
+            pass
+        return self.results()
+
+    def winner(self):
+        if not self.two_players or self.score1 > self.score2:
+            return "Player 1"
+        return "Player 2" if self.score2 > self.score1 else "Draw"
+
+    def results(self):
+        """
+        Returns the metrics gathered at game over (the fields of results.DTYPE).
+        """
+        avg_moves1 = sum(self.moves_per_goal1) / len(self.moves_per_goal1) if self.moves_per_goal1 else 0
+        avg_moves2 = sum(self.moves_per_goal2) / len(self.moves_per_goal2) if self.moves_per_goal2 else 0
+        avg_time1 = sum(self.times1.values()) / len(self.times1) if self.times1 else 0
+        avg_time2 = sum(self.times2.values()) / len(self.times2) if self.times2 else 0
+        return {"level": self.level, "algorithm1": self.algorithm1, "algorithm2": self.algorithm2,
+                "seed": self.seed, "turns": self.turn, "score1": self.score1, "score2": self.score2,
+                "avg_moves1": avg_moves1, "avg_moves2": avg_moves2,
+                "avg_time1": avg_time1, "avg_time2": avg_time2,
+                "plan_time1": self.plan_time[0], "plan_time2": self.plan_time[1],
+                "expanded1": self.expanded[0], "expanded2": self.expanded[1]}
+
+    def write_results(self, directory=RESULTS_DIR):
+        # Store the results of this game in the results store, used for plotting
+        with ResultsWriter(directory) as writer:
+            writer.append(self.results())
@@ -0,0 +1,145 @@
+import collections
+import functools
+import time
+import tracemalloc
+import frontier
+
+# Search instrumentation. While disabled the searches get the plain deque,
+# list and Frontier classes and the only cost is one flag check per call.
+# While enabled they get counting subclasses, and every search appends a
+# record (a dict) to `records`:
+#   algorithm, expanded, generated, peak_frontier, cutoffs, time,
+#   peak_memory (bytes, only with enable(memory=True)), path_length
+# Usage: stats.enable(); bfs(...); stats.disable(); stats.summary()
+
+enabled = False
+track_memory = False
+records = []
+_current = None
+
+class Record(dict):
+    def __init__(self, algorithm):
+        super().__init__(algorithm=algorithm, expanded=0, generated=0, peak_frontier=0,
+                         cutoffs=0, time=0.0, peak_memory=0, path_length=0)
+
+def _pushed(size):
+    r = _current
+    if r is not None:
+        r["generated"] += 1
+        if size > r["peak_frontier"]:
+            r["peak_frontier"] = size
+
+def _popped():
+    if _current is not None:
+        _current["expanded"] += 1
+
+class CountingDeque(collections.deque):
+    def append(self, x):
+        collections.deque.append(self, x)
+        _pushed(len(self))
+
+    def popleft(self):
+        _popped()
+        return collections.deque.popleft(self)
+
+    def pop(self):
+        _popped()
+        return collections.deque.pop(self)
+
+class CountingList(list):
+    def append(self, x):
+        list.append(self, x)
+        _pushed(len(self))
+
+    def pop(self):
+        _popped()
+        return list.pop(self)
+
+class CountingFrontier(frontier.Frontier):
+    __slots__ = ()
+
+    def push(self, item, priority, data=None):
+        if frontier.Frontier.push(self, item, priority, data):
+            # Heap size, stale decrease-key entries included
+            _pushed(len(self.heap))
+            return True
+        return False
+
+    def pop(self):
+        _popped()
+        return frontier.Frontier.pop(self)
+
+# Containers the searches build their frontiers from
+deque = collections.deque
+stack = list
+Frontier = frontier.Frontier
+
+def enable(memory=False):
+    """
+    Starts recording. memory=True also tracks peak allocations (tracemalloc,
+    which slows the searches down a lot).
+    """
+    global enabled, track_memory, deque, stack, Frontier
+    enabled, track_memory = True, memory
+    deque, stack, Frontier = CountingDeque, CountingList, CountingFrontier
+
+def disable():
+    global enabled, track_memory, deque, stack, Frontier
+    enabled, track_memory = False, False
+    deque, stack, Frontier = collections.deque, list, frontier.Frontier
+
+def add(field, n):
+    """
+    Adds n to a counter of the running search (no-op when disabled).
+    """
+    if _current is not None:
+        _current[field] += n
+
+def instrumented(search):
+    """
+    Decorator for the search functions: times them and collects a record.
+    """
+    @functools.wraps(search)
+    def wrapper(*args, **kwargs):
+        global _current
+        if not enabled or _current is not None:
+            return search(*args, **kwargs)
+        _current = record = Record(search.__name__)
+        if track_memory:
+            tracemalloc.start()
+        t = time.perf_counter()
+        try:
+            path = search(*args, **kwargs)
+        finally:
+            record["time"] = time.perf_counter() - t
+            if track_memory:
+                record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            _current = None
+        record["path_length"] = len(path)
+        records.append(record)
+        return path
+    return wrapper
+
+def summary(rows=None):
+    """
+    Aggregates records per algorithm: count, totals and means, expansions/sec.
+    """
+    groups = {}
+    for r in records if rows is None else rows:
+        groups.setdefault(r["algorithm"], []).append(r)
+    result = {}
+    for algorithm, group in groups.items():
+        total_time = sum(r["time"] for r in group)
+        expanded = sum(r["expanded"] for r in group)
+        result[algorithm] = {
+            "searches": len(group),
+            "expanded": expanded,
+            "generated": sum(r["generated"] for r in group),
+            "cutoffs": sum(r["cutoffs"] for r in group),
+            "peak_frontier": max(r["peak_frontier"] for r in group),
+            "peak_memory": max(r["peak_memory"] for r in group),
+            "mean_time": total_time / len(group),
+            "expansions_per_sec": expanded / total_time if total_time else 0.0,
+        }
+    return result
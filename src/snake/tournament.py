@@ -0,0 +1,102 @@
+import argparse
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from simulation import *
+
+# Batch runner: every algorithm x level x seed (and --two pairings) on all cores
+# Usage: python tournament.py [--seeds N] [--turns N] [--workers N] [--no-two] [--reuse] [--oracle DIR] [--out FILE] [--store DIR]
+
+FIELDS = ["algorithm1", "algorithm2", "level", "seed", "score1", "score2",
+          "avg_moves1", "avg_moves2", "avg_time1", "avg_time2"]
+
+def matchups(algorithms, levels, seeds, two_players=True):
+    """
+    Returns the (algorithm1, algorithm2, level, seed) jobs of a full sweep.
+    algorithm2 is None for single player games.
+    """
+    pairings = [(a, None) for a in algorithms]
+    if two_players:
+        pairings += list(itertools.permutations(algorithms, 2))
+    return [(a1, a2, level, seed) for (a1, a2) in pairings for level in levels for seed in seeds]
+
+def play(job, max_turns=MAX_TURNS, oracle_dir=None, reuse=False):
+    """
+    Plays one game headless. The seed fixes the map, the food and random_move.
+    """
+    algorithm1, algorithm2, level, seed = job
+    random.seed(seed)
+    r = SnakeSimulation(level, algorithm1, algorithm2, max_turns=max_turns, seed=seed, oracle_dir=oracle_dir, reuse=reuse).run()
+    return dict(r, algorithm1=algorithm1, algorithm2=algorithm2 or "", seed=seed)
+
+def _play(args):
+    return play(*args)
+
+def run_tournament(algorithms=None, levels=None, seeds=range(10), two_players=True, max_turns=MAX_TURNS, workers=None, oracle_dir=None, reuse=False):
+    """
+    Runs the sweep on a process pool, results come back in job order.
+    """
+    jobs = matchups(algorithms or list(ALGORITHMS), levels or list(LEVELS), list(seeds), two_players)
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(jobs) // (8 * workers))
+        return list(pool.map(_play, [(job, max_turns, oracle_dir, reuse) for job in jobs], chunksize=chunksize))
+
+def aggregate(results):
+    """
+    Averages the results over seeds for each (algorithm1, algorithm2, level).
+    """
+    groups = {}
+    for r in results:
+        groups.setdefault((r["algorithm1"], r["algorithm2"], r["level"]), []).append(r)
+    summary = []
+    for (a1, a2, level), rows in groups.items():
+        n = len(rows)
+        row = {"algorithm1": a1, "algorithm2": a2, "level": level, "games": n}
+        for field in ("score1", "score2", "avg_moves1", "avg_moves2", "avg_time1", "avg_time2"):
+            row[field] = sum(r[field] or 0 for r in rows) / n
+        row["wins1"] = sum(1 for r in rows if (r["score1"] or 0) > (r["score2"] or 0))
+        row["wins2"] = sum(1 for r in rows if (r["score2"] or 0) > (r["score1"] or 0))
+        summary.append(row)
+    return summary
+
+def write_csv(filename, rows, fields):
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every search algorithm on every level headless.")
+    parser.add_argument("--seeds", type=int, default=10, help="number of seeds per matchup")
+    parser.add_argument("--turns", type=int, default=MAX_TURNS, help="turn budget per game")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--levels", nargs="+", default=list(LEVELS), choices=list(LEVELS))
+    parser.add_argument("--no-two", action="store_true", help="skip the head-to-head pairings")
+    parser.add_argument("--reuse", action="store_true", help="let planners reuse earlier searches (bfs and ucs then play alike)")
+    parser.add_argument("--oracle", default=None, metavar="DIR", help="precompute next-hop tables per map into DIR (implies --reuse)")
+    parser.add_argument("--out", default="tournament", help="prefix of the output csv files")
+    parser.add_argument("--store", default=None, metavar="DIR", help="also append every game to the results store in DIR")
+    args = parser.parse_args()
+
+    results = run_tournament(args.algorithms, args.levels, range(args.seeds), not args.no_two, args.turns, args.workers, args.oracle, args.reuse)
+    summary = aggregate(results)
+    write_csv(f"{args.out}.csv", results, FIELDS)
+    if args.store:
+        with ResultsWriter(args.store) as writer:
+            writer.extend(results)
+    write_csv(f"{args.out}_summary.csv", summary,
+              ["algorithm1", "algorithm2", "level", "games", "score1", "score2", "wins1", "wins2",
+               "avg_moves1", "avg_moves2", "avg_time1", "avg_time2"])
+
+    # Ranking of the single player games (mean score over all levels)
+    ranking = {}
+    for row in summary:
+        if not row["algorithm2"]:
+            ranking.setdefault(row["algorithm1"], []).append(row["score1"])
+    for algorithm, scores in sorted(ranking.items(), key=lambda kv: -sum(kv[1]) / len(kv[1])):
+        print(f"{algorithm:>12}: {sum(scores) / len(scores):.2f}")
+    print(f"{len(results)} games written to {args.out}.csv and {args.out}_summary.csv")
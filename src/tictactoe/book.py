@@ -0,0 +1,120 @@
+"""
+Tic Tac Toe opening book: the whole game solved once, up to symmetry
+
+Usage: python book.py    (writes book.bin next to this file)
+
+File layout (little endian):
+	b"TTTB", count (uint32),
+	count canonical keys (uint32, sorted),
+	count entries (uint8): best cell in canonical orientation | (value + 1) << 4
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+
+import engine
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+MAGIC = b"TTTB"
+
+def canonical_symmetry(me, opp):
+	"""
+	Returns (canonical key, index of the symmetry that produces it).
+	"""
+	return min((table[me] << 9 | table[opp], s) for s, table in enumerate(engine.SYMMETRY_TABLES))
+
+# INVERSE[s][cell] = cell that symmetry s maps onto `cell`
+INVERSE = [tuple(perm.index(c) for c in range(9)) for perm in engine.SYMMETRIES]
+
+def positions():
+	"""
+	Returns the canonical (me, opp) bitboards of every reachable non-terminal
+	position, `me` being the player to move.
+	"""
+	found = {}
+	stack = [(0, 0)]
+	while stack:
+		me, opp = stack.pop()
+		key, s = canonical_symmetry(me, opp)
+		if key in found or engine.wins(opp) or me | opp == engine.FULL:
+			continue
+		found[key] = (engine.SYMMETRY_TABLES[s][me], engine.SYMMETRY_TABLES[s][opp])
+		empty = engine.FULL & ~(me | opp)
+		while empty:
+			bit = empty & -empty
+			empty ^= bit
+			stack.append((opp, me | bit))
+	return found
+
+def build(filename=BOOK_FILE):
+	"""
+	Solves every position and writes the book. Returns the number of entries.
+	"""
+	found = positions()
+	keys = sorted(found)
+	entries = bytearray()
+	for key in keys:
+		me, opp = found[key]
+		# best_move takes (X, O) and reports X's value; me is X iff counts match
+		if engine.x_to_move(me, opp):
+			value, move = engine.best_move(me, opp)
+		else:
+			value, move = engine.best_move(opp, me)
+			value = -value
+		entries.append(move | (value + 1) << 4)
+	with open(filename, "wb") as file:
+		file.write(MAGIC + struct.pack("<I", len(keys)))
+		file.write(struct.pack(f"<{len(keys)}I", *keys))
+		file.write(bytes(entries))
+	return len(keys)
+
+class Book:
+	"""
+	Read-only view of a book file, memory-mapped.
+	"""
+	def __init__(self, filename=BOOK_FILE):
+		with open(filename, "rb") as file:
+			self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		if self.data[:4] != MAGIC:
+			raise ValueError(f"{filename} is not a tic-tac-toe book")
+		count = struct.unpack_from("<I", self.data, 4)[0]
+		view = memoryview(self.data)
+		self.keys = view[8:8 + 4 * count].cast("I")
+		self.entries = view[8 + 4 * count:8 + 5 * count]
+
+	def lookup(self, x, o):
+		"""
+		Returns (value for X, best cell) of a non-terminal position, or None
+		if it is not in the book.
+		"""
+		x_turn = engine.x_to_move(x, o)
+		me, opp = (x, o) if x_turn else (o, x)
+		key, s = canonical_symmetry(me, opp)
+		i = bisect.bisect_left(self.keys, key)
+		if i == len(self.keys) or self.keys[i] != key:
+			return None
+		entry = self.entries[i]
+		value = (entry >> 4) - 1
+		return (value if x_turn else -value), INVERSE[s][entry & 15]
+
+_book = None
+
+def lookup(x, o):
+	"""
+	Looks a position up in book.bin, opened lazily on first use.
+	Returns None if there is no book file or no entry.
+	"""
+	global _book
+	if _book is None:
+		if not os.path.exists(BOOK_FILE):
+			return None
+		_book = Book(BOOK_FILE)
+	return _book.lookup(x, o)
+
+if __name__ == "__main__":
+	filename = sys.argv[1] if len(sys.argv) > 1 else BOOK_FILE
+	count = build(filename)
+	print(f"{count} positions written to {filename} ({os.path.getsize(filename)} bytes)")
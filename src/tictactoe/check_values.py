@@ -0,0 +1,84 @@
+"""
+Checks every search engine against the exact solver on every reachable position
+
+Usage: python check_values.py    (exits with status 1 and lists the mismatches if any)
+
+For each non-terminal position reachable from the empty board, the move each
+engine picks must have the game value engine.best_move gives the position,
+and OrderedSearch must return that value, in every ordering / PVS /
+aspiration configuration, with a fresh and with a reused transposition table.
+"""
+
+import itertools
+import sys
+
+import engine
+import tictactoe as ttt
+
+ENGINES = {"minimax": ttt.minimax, "alphabeta": ttt.alphabeta, "plain": ttt.plain_minimax,
+		   "ordered": ttt.ordered_alphabeta, "negascout": ttt.negascout}
+
+ORDERINGS = [(), ("static",), ("tt",), ("threats",), ("history",),
+			 ("static", "tt", "threats"), ("static", "tt", "threats", "history")]
+
+CONFIGS = [dict(ordering=ordering, pvs=pvs, aspiration=aspiration) for ordering, pvs, aspiration in
+		   itertools.product(ORDERINGS, (False, True), (None, -1, 0, 1))]
+
+def positions():
+	"""
+	Returns every distinct non-terminal board reachable from the empty board.
+	"""
+	boards = [ttt.initial_state()]
+	found = {}
+	while boards:
+		board = boards.pop()
+		key = tuple(map(tuple, board))
+		if key in found or ttt.terminal(board):
+			continue
+		found[key] = board
+		boards.extend(ttt.result(board, action) for action in ttt.actions(board))
+	return list(found.values())
+
+def move_value(x, o, cell):
+	"""
+	Returns the game value for X after the player to move takes cell.
+	"""
+	x_turn = engine.x_to_move(x, o)
+	me, opp = (x, o) if x_turn else (o, x)
+	me |= 1 << cell
+	if engine.wins(me):
+		value = 1
+	elif me | opp == engine.FULL:
+		value = 0
+	else:
+		value = -engine.solve(opp, me)
+	return value if x_turn else -value
+
+def check():
+	"""
+	Returns (positions checked, list of mismatch descriptions).
+	"""
+	boards = positions()
+	shared = [ttt.OrderedSearch(**config) for config in CONFIGS]
+	mismatches = []
+	for board in boards:
+		x, o = engine.to_bits(board)
+		value = engine.best_move(x, o)[0]
+		for name, search in ENGINES.items():
+			i, j = search(board)
+			if move_value(x, o, 3 * i + j) != value:
+				mismatches.append(f"{name}: {board} plays {(i, j)}, value {value}")
+		for config, reused in zip(CONFIGS, shared):
+			for label, searcher in (("fresh", ttt.OrderedSearch(**config)), ("reused", reused)):
+				v, (i, j) = searcher.search(board)
+				if v != value or move_value(x, o, 3 * i + j) != value:
+					mismatches.append(f"OrderedSearch({config}, {label}): {board} gives {v} and {(i, j)}, value {value}")
+	return len(boards), mismatches
+
+if __name__ == "__main__":
+	count, mismatches = check()
+	for line in mismatches:
+		print(line)
+	print(f"{count} positions, {len(ENGINES)} engines and {len(CONFIGS)} OrderedSearch configurations: "
+		  f"{len(mismatches)} mismatches")
+	sys.exit(1 if mismatches else 0)
@@ -0,0 +1,105 @@
+"""
+Bitboard Tic Tac Toe engine
+"""
+
+# Cell (i, j) is bit 3 * i + j of a 9-bit board, one board per player.
+FULL = 0b111111111
+
+# Rows, columns, diagonal, anti-diagonal
+WIN_MASKS = tuple(sum(1 << (3 * i + j) for i, j in line) for line in (
+	[(0, 0), (0, 1), (0, 2)], [(1, 0), (1, 1), (1, 2)], [(2, 0), (2, 1), (2, 2)],
+	[(0, 0), (1, 0), (2, 0)], [(0, 1), (1, 1), (2, 1)], [(0, 2), (1, 2), (2, 2)],
+	[(0, 0), (1, 1), (2, 2)], [(0, 2), (1, 1), (2, 0)],
+))
+
+# The 8 symmetries of the square, as cell permutations (cell -> image)
+def _symmetries():
+	cells = [(i, j) for i in range(3) for j in range(3)]
+	maps = [
+		lambda i, j: (i, j), lambda i, j: (j, 2 - i), lambda i, j: (2 - i, 2 - j), lambda i, j: (2 - j, i),
+		lambda i, j: (i, 2 - j), lambda i, j: (2 - i, j), lambda i, j: (j, i), lambda i, j: (2 - j, 2 - i),
+	]
+	return [tuple(3 * f(i, j)[0] + f(i, j)[1] for i, j in cells) for f in maps]
+
+SYMMETRIES = _symmetries()
+
+# SYMMETRY_TABLES[s][bits] = bits mapped through symmetry s, for all 512 boards
+SYMMETRY_TABLES = [
+	[sum(1 << perm[c] for c in range(9) if bits >> c & 1) for bits in range(512)]
+	for perm in SYMMETRIES
+]
+
+def to_bits(board):
+	"""
+	Returns the (X, O) bitboards of a nested list board.
+	"""
+	x = o = 0
+	for i, row in enumerate(board):
+		for j, cell in enumerate(row):
+			if cell == "X":
+				x |= 1 << (3 * i + j)
+			elif cell == "O":
+				o |= 1 << (3 * i + j)
+	return x, o
+
+def wins(bits):
+	"""
+	Returns True if the bitboard contains a full line.
+	"""
+	for mask in WIN_MASKS:
+		if bits & mask == mask:
+			return True
+	return False
+
+def x_to_move(x, o):
+	return bin(x).count("1") == bin(o).count("1")
+
+def canonical(x, o):
+	"""
+	Returns the transposition table key of a position: the smallest 18-bit
+	encoding among its 8 symmetric images.
+	"""
+	return min(table[x] << 9 | table[o] for table in SYMMETRY_TABLES)
+
+# Transposition table: canonical key -> game value for the side to move
+TABLE = {}
+
+def solve(me, opp):
+	"""
+	Returns the game value (1 win, 0 draw, -1 loss) for the player to move,
+	who owns the `me` bitboard. Exact values, memoized up to symmetry.
+	"""
+	key = canonical(me, opp)
+	value = TABLE.get(key)
+	if value is not None:
+		return value
+	if wins(opp):
+		value = -1
+	elif me | opp == FULL:
+		value = 0
+	else:
+		value = -1
+		empty = FULL & ~(me | opp)
+		while empty and value < 1:
+			bit = empty & -empty
+			empty ^= bit
+			value = max(value, -solve(opp, me | bit))
+	TABLE[key] = value
+	return value
+
+def best_move(x, o):
+	"""
+	Returns (value for X, best cell) of a non-terminal position, cells are
+	tried in order 0..8 and the first best one wins.
+	"""
+	x_turn = x_to_move(x, o)
+	me, opp = (x, o) if x_turn else (o, x)
+	best, move = -2, None
+	for cell in range(9):
+		bit = 1 << cell
+		if (me | opp) & bit:
+			continue
+		value = -solve(opp, me | bit)
+		if value > best:
+			best, move = value, cell
+	return (best if x_turn else -best), move
@@ -0,0 +1,206 @@
+"""
+Headless match harness: tic-tac-toe engines against each other (and themselves)
+
+Usage: python match.py [--engines minimax alphabeta random depth2] [--games N] [--plies N]
+                       [--enumerate] [--workers N] [--seed N] [--out FILE]
+
+Engines:
+	minimax     tictactoe.minimax (opening book, bitboard search as fallback)
+	alphabeta   tictactoe.alphabeta (max_value / min_value on a SearchBoard)
+	plain       tictactoe.plain_minimax (no pruning, slow from the empty board)
+	ordered     tictactoe.ordered_alphabeta (move ordering and transposition table)
+	negascout   tictactoe.negascout (ordered PVS with an aspiration window)
+	random      uniformly random legal move (seeded per game)
+	depthN      mnk.Searcher limited to N plies with the window evaluation
+	mctsN       mcts.MCTS with N ms per move (mcts: 100 ms), tree kept between moves
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mcts
+import mnk
+import tictactoe as ttt
+
+ENGINES = ("minimax", "alphabeta", "plain", "ordered", "negascout", "random")
+
+SEARCHES = {"alphabeta": ttt.alphabeta, "plain": ttt.plain_minimax,
+			"ordered": ttt.ordered_alphabeta, "negascout": ttt.negascout}
+
+def make_engine(name, rng):
+	"""
+	Returns a function board -> (action, nodes searched) for an engine name.
+	"""
+	if name == "minimax":
+		return lambda board: (ttt.minimax(board), 0)
+	if name in SEARCHES:
+		search = SEARCHES[name]
+		def move(board):
+			action, record = ttt.search_stats(board, search)
+			return action, record["expanded"]
+		return move
+	if name == "random":
+		return lambda board: (rng.choice(sorted(ttt.actions(board))), 0)
+	if name.startswith("depth") and name[5:].isdigit():
+		game = mnk.Game(3, 3, 3)
+		depth = int(name[5:])
+		def move(board):
+			x, o = mnk.to_bits(board)
+			me, opp = (x, o) if ttt.player(board) == ttt.X else (o, x)
+			# A fresh searcher per move, so node counts do not depend on earlier moves
+			searcher = mnk.Searcher(game, time_limit=float("inf"), max_depth=depth)
+			cell = searcher.search(me, opp)[0]
+			return divmod(cell, 3), searcher.nodes
+		return move
+	if name == "mcts" or name.startswith("mcts") and name[4:].isdigit():
+		searcher = mcts.MCTS(mnk.Game(3, 3, 3), int(name[4:] or 100), seed=rng.getrandbits(32) if rng else None)
+		def move(board):
+			x, o = mnk.to_bits(board)
+			me, opp = (x, o) if ttt.player(board) == ttt.X else (o, x)
+			cell, visits = searcher.search(me, opp)
+			return divmod(cell, 3), visits
+		return move
+	raise ValueError(f"Unknown engine: {name}")
+
+def enumerate_openings(plies):
+	"""
+	Returns every distinct non-terminal board reachable in `plies` moves.
+	"""
+	boards = [ttt.initial_state()]
+	for _ in range(plies):
+		found = {}
+		for board in boards:
+			for action in sorted(ttt.actions(board)):
+				child = ttt.result(board, action)
+				if not ttt.terminal(child):
+					found.setdefault(tuple(map(tuple, child)), child)
+		boards = list(found.values())
+	return boards
+
+def random_openings(count, plies, seed=0):
+	"""
+	Returns count boards after `plies` random moves (non-terminal), seeded.
+	"""
+	rng = random.Random(seed)
+	openings = []
+	while len(openings) < count:
+		board = ttt.initial_state()
+		for _ in range(plies):
+			board = ttt.result(board, rng.choice(sorted(ttt.actions(board))))
+			if ttt.terminal(board):
+				break
+		else:
+			openings.append(board)
+	return openings
+
+def play(job):
+	"""
+	Plays one game from an opening. Returns a dict with the winner ("X", "O"
+	or "" for a tie) and per-engine move latencies (seconds) and node counts.
+	"""
+	x_engine, o_engine, opening, board, seed = job
+	rng = random.Random(seed)
+	engines = {ttt.X: make_engine(x_engine, rng), ttt.O: make_engine(o_engine, rng)}
+	latencies = {ttt.X: [], ttt.O: []}
+	nodes = {ttt.X: [], ttt.O: []}
+	while not ttt.terminal(board):
+		side = ttt.player(board)
+		t = time.perf_counter()
+		action, searched = engines[side](board)
+		latencies[side].append(time.perf_counter() - t)
+		nodes[side].append(searched)
+		board = ttt.result(board, action)
+	return {"x_engine": x_engine, "o_engine": o_engine, "opening": opening, "seed": seed,
+			"winner": ttt.winner(board) or "", "latencies": latencies, "nodes": nodes}
+
+def jobs(engines, openings, seed=0):
+	"""
+	Every ordered pairing (self-play included) from every opening.
+	"""
+	pairings = list(itertools.product(engines, repeat=2))
+	return [(x, o, i, board, seed + n) for n, ((x, o), (i, board)) in
+			enumerate(itertools.product(pairings, enumerate(openings)))]
+
+def run_matches(engines, openings, workers=None, seed=0):
+	todo = jobs(engines, openings, seed)
+	workers = workers or os.cpu_count()
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		return list(pool.map(play, todo, chunksize=max(1, len(todo) // (8 * workers))))
+
+def percentile(values, p):
+	"""
+	Nearest-rank percentile of a sorted list.
+	"""
+	if not values:
+		return 0.0
+	return values[min(len(values) - 1, max(0, -(-p * len(values) // 100) - 1))]
+
+def report(games):
+	"""
+	Returns (outcomes per pairing, move statistics per engine) as lists of dicts.
+	"""
+	outcomes = {}
+	for g in games:
+		row = outcomes.setdefault((g["x_engine"], g["o_engine"]), {"games": 0, "X": 0, "draw": 0, "O": 0})
+		row["games"] += 1
+		row[g["winner"] or "draw"] += 1
+	moves = {}
+	for g in games:
+		for side, name in ((ttt.X, g["x_engine"]), (ttt.O, g["o_engine"])):
+			entry = moves.setdefault(name, ([], []))
+			entry[0].extend(g["latencies"][side])
+			entry[1].extend(g["nodes"][side])
+	engines = []
+	for name, (latencies, nodes) in moves.items():
+		latencies.sort()
+		engines.append({"engine": name, "moves": len(latencies),
+						"p50_ms": 1000 * percentile(latencies, 50), "p90_ms": 1000 * percentile(latencies, 90),
+						"p99_ms": 1000 * percentile(latencies, 99), "max_ms": 1000 * (latencies[-1] if latencies else 0),
+						"nodes_per_move": sum(nodes) / len(nodes) if nodes else 0, "nodes": sum(nodes)})
+	pairings = [dict(x_engine=x, o_engine=o, **row) for (x, o), row in outcomes.items()]
+	return pairings, engines
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Play tic-tac-toe engines against each other headless.")
+	parser.add_argument("--engines", nargs="+", default=["minimax", "alphabeta", "random", "depth2"],
+						help=f"any of {', '.join(ENGINES)}, depthN, mctsN")
+	parser.add_argument("--games", type=int, default=100, help="random openings per pairing")
+	parser.add_argument("--plies", type=int, default=2, help="moves played before the engines take over")
+	parser.add_argument("--enumerate", action="store_true", help="play every opening of --plies moves instead")
+	parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--out", default=None, metavar="FILE", help="csv with one row per game")
+	args = parser.parse_args()
+	for name in args.engines:
+		make_engine(name, None)
+
+	openings = enumerate_openings(args.plies) if args.enumerate else random_openings(args.games, args.plies, args.seed)
+	t = time.perf_counter()
+	games = run_matches(args.engines, openings, args.workers, args.seed)
+	elapsed = time.perf_counter() - t
+	pairings, engines = report(games)
+
+	print(f"{len(games)} games from {len(openings)} openings in {elapsed:.1f}s\n")
+	print(f"{'X':>10} {'O':>10} {'games':>6} {'X wins':>7} {'draws':>7} {'O wins':>7}")
+	for row in pairings:
+		n = row["games"]
+		print(f"{row['x_engine']:>10} {row['o_engine']:>10} {n:>6} {100 * row['X'] / n:>6.1f}% "
+			  f"{100 * row['draw'] / n:>6.1f}% {100 * row['O'] / n:>6.1f}%")
+	print(f"\n{'engine':>10} {'moves':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'nodes/move':>11}")
+	for row in engines:
+		print(f"{row['engine']:>10} {row['moves']:>7} {row['p50_ms']:>8.3f} {row['p90_ms']:>8.3f} "
+			  f"{row['p99_ms']:>8.3f} {row['max_ms']:>8.3f} {row['nodes_per_move']:>11.1f}")
+
+	if args.out:
+		with open(args.out, "w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(["x_engine", "o_engine", "opening", "seed", "winner", "x_moves", "o_moves", "x_nodes", "o_nodes"])
+			for g in games:
+				writer.writerow([g["x_engine"], g["o_engine"], g["opening"], g["seed"], g["winner"],
+								 len(g["latencies"][ttt.X]), len(g["latencies"][ttt.O]),
+								 sum(g["nodes"][ttt.X]), sum(g["nodes"][ttt.O])])
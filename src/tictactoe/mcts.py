@@ -0,0 +1,301 @@
+"""
+Monte Carlo tree search (UCT) for m,n,k-games, for boards too large for alpha-beta
+
+Usage: python mcts.py [rows cols k ms games]    (MCTS against the mnk.py Searcher, same time per move)
+"""
+
+import math
+import random
+import sys
+import time
+
+from mnk import Game, Searcher, to_bits
+
+# Proven values of a node, for the player who moved into it (MCTS-Solver)
+WIN, DRAW, LOSS, UNKNOWN = 1, 0, -1, 2
+
+def playouts(game, me, opp, count, rng):
+	"""
+	Plays count random games from a position. Returns the total score of the
+	player to move (`me`): 1 per win, 0.5 per draw.
+	"""
+	empty = [c for c in range(game.size) if not (me | opp) >> c & 1]
+	lines = game.lines
+	total = 0.0
+	for _ in range(count):
+		rng.shuffle(empty)
+		a, b, turn = me, opp, 0
+		score = 0.5
+		for c in empty:
+			a |= 1 << c
+			for w in lines[c]:
+				if a & w == w:
+					score = 1.0 - turn
+					break
+			else:
+				a, b, turn = b, a, 1 - turn
+				continue
+			break
+		total += score
+	return total
+
+class Tree:
+	"""
+	Node store: parallel lists indexed by node id, node 0 the root. The
+	children of a node are allocated together, ids first .. first + count - 1.
+	reward is the total playout score of the player who moved into the node.
+	"""
+	__slots__ = ("parent", "move", "first", "count", "visits", "reward", "proven")
+
+	def __init__(self):
+		self.parent, self.move = [-1], [-1]
+		self.first, self.count = [-1], [0]
+		self.visits, self.reward = [0], [0.0]
+		self.proven = [UNKNOWN]
+
+	def __len__(self):
+		return len(self.parent)
+
+	def add_children(self, node, moves):
+		first = len(self.parent)
+		n = len(moves)
+		self.parent.extend([node] * n)
+		self.move.extend(moves)
+		self.first.extend([-1] * n)
+		self.count.extend([0] * n)
+		self.visits.extend([0] * n)
+		self.reward.extend([0.0] * n)
+		self.proven.extend([UNKNOWN] * n)
+		self.first[node], self.count[node] = first, n
+		return first
+
+	def subtree(self, root):
+		"""
+		Returns a new, compact Tree holding the subtree of root (as node 0).
+		"""
+		tree = Tree()
+		tree.visits[0], tree.reward[0], tree.proven[0] = self.visits[root], self.reward[root], self.proven[root]
+		queue = [(root, 0)]
+		for old, new in queue:
+			if self.first[old] < 0:
+				continue
+			children = range(self.first[old], self.first[old] + self.count[old])
+			first = tree.add_children(new, [self.move[c] for c in children])
+			for i, c in enumerate(children):
+				tree.visits[first + i] = self.visits[c]
+				tree.reward[first + i] = self.reward[c]
+				tree.proven[first + i] = self.proven[c]
+				queue.append((c, first + i))
+		return tree
+
+class MCTS:
+	"""
+	UCT with batched random playouts (batch per leaf), proven wins / losses /
+	draws backed up through the tree (so small games get solved exactly), an
+	anytime budget in milliseconds, and the tree kept between moves: the next
+	search starts from the subtree of the position actually reached.
+	"""
+	def __init__(self, game, budget_ms=100, batch=8, exploration=1.4, max_nodes=1 << 20, reuse=True, seed=None):
+		self.game = game
+		self.budget_ms = budget_ms
+		self.batch = batch
+		self.exploration = exploration
+		self.max_nodes = max_nodes
+		self.reuse = reuse
+		self.rng = random.Random(seed)
+		self.tree = None
+		self.position = None  # (me, opp) of the tree root
+		self.playouts = 0
+		self.iterations = 0
+
+	def _reroot(self, me, opp):
+		# Node of the tree reached by the moves played since the last search, or None
+		if self.tree is None:
+			return None
+		a, b = self.position
+		if a & ~(me | opp) or b & ~(me | opp):
+			return None
+		plies = bin(me | opp).count("1") - bin(a | b).count("1")
+		tree, node = self.tree, 0
+		for d in range(plies):
+			if tree.first[node] < 0:
+				return None
+			# Stones of the player to move at this node, in the target position
+			target = me if (plies - d) % 2 == 0 else opp
+			new = target & ~a
+			for child in range(tree.first[node], tree.first[node] + tree.count[node]):
+				if new >> tree.move[child] & 1:
+					break
+			else:
+				return None
+			a, b = b, a | 1 << tree.move[child]
+			node = child
+		return node if (a, b) == (me, opp) else None
+
+	def search(self, me, opp):
+		"""
+		Returns (move, root visits) for the player owning `me`, after
+		budget_ms milliseconds (or earlier when the position is solved).
+		"""
+		game = self.game
+		if me | opp == game.full:
+			return None, 0
+		node = self._reroot(me, opp) if self.reuse else None
+		self.tree = Tree() if node is None else self.tree.subtree(node)
+		self.position = (me, opp)
+		tree = self.tree
+		deadline = time.perf_counter() + self.budget_ms / 1000
+		while tree.proven[0] == UNKNOWN and time.perf_counter() < deadline:
+			self._iterate(tree, me, opp)
+		return self._choose(tree), tree.visits[0]
+
+	def _iterate(self, tree, me, opp):
+		self.iterations += 1
+		game = self.game
+		node, a, b = 0, me, opp
+		# Selection: a, b = player to move at node, the other
+		while tree.first[node] >= 0 and tree.proven[node] == UNKNOWN:
+			node = self._select(tree, node)
+			a, b = b, a | 1 << tree.move[node]
+		proven = tree.proven[node]
+		if proven != UNKNOWN:
+			n, score = 1, 0.5 + proven / 2
+		else:
+			if tree.visits[node] > 0 and len(tree) < self.max_nodes:
+				node, a, b = self._expand(tree, node, a, b)
+			proven = tree.proven[node]
+			if proven != UNKNOWN:
+				n, score = 1, 0.5 + proven / 2
+			else:
+				# Score of the player who moved into node
+				n = self.batch
+				score = n - playouts(game, a, b, n, self.rng)
+				self.playouts += n
+		self._backup(tree, node, n, score)
+
+	def _expand(self, tree, node, a, b):
+		# Adds all children (static order), marks the terminal ones, returns the first child
+		game = self.game
+		occupied = a | b
+		moves = [c for c in game.order if not occupied >> c & 1]
+		first = tree.add_children(node, moves)
+		full = len(moves) == 1
+		for i, c in enumerate(moves):
+			if game.wins_at(a | 1 << c, c):
+				tree.proven[first + i] = WIN
+			elif full:
+				tree.proven[first + i] = DRAW
+		return first, b, a | 1 << moves[0]
+
+	def _select(self, tree, node):
+		first, count = tree.first[node], tree.count[node]
+		visits, reward, proven = tree.visits, tree.reward, tree.proven
+		log = self.exploration * math.sqrt(math.log(visits[node] + 1))
+		best, best_score = first, -1.0
+		for child in range(first, first + count):
+			p = proven[child]
+			if p == WIN:
+				return child
+			if p == LOSS:
+				continue
+			v = visits[child]
+			if v == 0:
+				return child
+			mean = 0.5 if p == DRAW else reward[child] / v
+			score = mean + log / math.sqrt(v)
+			if score > best_score:
+				best, best_score = child, score
+		return best
+
+	def _backup(self, tree, node, n, score):
+		parent, visits, reward, proven = tree.parent, tree.visits, tree.reward, tree.proven
+		solved = proven[node] != UNKNOWN
+		while node >= 0:
+			visits[node] += n
+			reward[node] += score
+			p = parent[node]
+			if solved and p >= 0 and proven[p] == UNKNOWN:
+				solved = self._solve(tree, p)
+			else:
+				solved = False
+			node, score = p, n - score
+
+	def _solve(self, tree, node):
+		# Proves node from its children if possible, returns True if it did
+		first, count, proven = tree.first[node], tree.count[node], tree.proven
+		best = LOSS
+		for child in range(first, first + count):
+			p = proven[child]
+			if p == WIN:
+				proven[node] = LOSS
+				return True
+			if p == UNKNOWN:
+				return False
+			best = max(best, p)
+		proven[node] = -best
+		return True
+
+	def _choose(self, tree):
+		# A proven win, a proven draw if that is the best there is, else the most visited non-losing move
+		first, count = tree.first[0], tree.count[0]
+		if first < 0:
+			occupied = self.position[0] | self.position[1]
+			return next(c for c in self.game.order if not occupied >> c & 1)
+		children = range(first, first + count)
+		proven = tree.proven
+		for child in children:
+			if proven[child] == WIN or (proven[0] == DRAW and proven[child] == DRAW):
+				return tree.move[child]
+		candidates = [c for c in children if proven[c] != LOSS] or list(children)
+		return tree.move[max(candidates, key=tree.visits.__getitem__)]
+
+# One searcher per board geometry, so best_move() keeps its tree between moves
+_searchers = {}
+
+def best_move(board, k=3, budget_ms=100, **options):
+	"""
+	Returns the (i, j) move for the player to move on a nested list board,
+	searched for about budget_ms milliseconds.
+	"""
+	key = (len(board), len(board[0]), k)
+	searcher = _searchers.get(key)
+	if searcher is None or options:
+		searcher = _searchers[key] = MCTS(Game(*key), budget_ms, **options)
+	searcher.budget_ms = budget_ms
+	x, o = to_bits(board)
+	me, opp = (x, o) if bin(x).count("1") == bin(o).count("1") else (o, x)
+	move = searcher.search(me, opp)[0]
+	return None if move is None else divmod(move, searcher.game.cols)
+
+def mcts(board):
+	"""
+	Returns the action for the current player on a 3x3 board: the same
+	(board) -> action contract as tictactoe.minimax.
+	"""
+	return best_move(board, 3)
+
+if __name__ == "__main__":
+	args = [int(a) for a in sys.argv[1:6]]
+	rows, cols, k, ms, games = args + [7, 7, 4, 200, 4][len(args):]
+	game = Game(rows, cols, k)
+	results = {"mcts": 0, "searcher": 0, "draw": 0}
+	for g in range(games):
+		# Colours alternate between games
+		players = [MCTS(game, ms, seed=g), Searcher(game, time_limit=ms / 1000)]
+		names = ["mcts", "searcher"]
+		if g % 2:
+			players.reverse()
+			names.reverse()
+		me = opp = 0
+		turn = 0
+		while True:
+			move = players[turn].search(me, opp)[0]
+			me |= 1 << move
+			if game.wins_at(me, move):
+				results[names[turn]] += 1
+				break
+			if me | opp == game.full:
+				results["draw"] += 1
+				break
+			me, opp, turn = opp, me, 1 - turn
+		print(f"game {g + 1}: {names[0]} (X) vs {names[1]} (O), {results}")
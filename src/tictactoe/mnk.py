@@ -0,0 +1,189 @@
+"""
+m,n,k-game engine (k in a row on an m x n board), e.g. 4x4 with k=4 or 5x5 with k=4
+"""
+
+import time
+
+WIN = 1000000
+INF = 2 * WIN
+
+class Game:
+	"""
+	Board geometry and win lines of an m,n,k-game. Cell (i, j) is bit
+	i * cols + j of a Python int bitboard, one bitboard per player.
+	"""
+	def __init__(self, rows=3, cols=3, k=3):
+		self.rows, self.cols, self.k = rows, cols, k
+		self.size = rows * cols
+		self.full = (1 << self.size) - 1
+		# Every window of k cells in a row / column / diagonal
+		windows = []
+		for i in range(rows):
+			for j in range(cols):
+				for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+					cells = [(i + s * di, j + s * dj) for s in range(k)]
+					if all(0 <= a < rows and 0 <= b < cols for a, b in cells):
+						windows.append(sum(1 << (a * cols + b) for a, b in cells))
+		self.windows = tuple(windows)
+		# Windows through each cell, so a move only checks its own lines
+		self.lines = tuple(tuple(w for w in windows if w >> c & 1) for c in range(self.size))
+		# Static move order: closest to the centre first
+		ci, cj = (rows - 1) / 2, (cols - 1) / 2
+		self.order = tuple(sorted(range(self.size), key=lambda c: abs(c // cols - ci) + abs(c % cols - cj)))
+
+	def wins_at(self, bits, cell):
+		"""
+		Returns True if bits has a full window through cell.
+		"""
+		for w in self.lines[cell]:
+			if bits & w == w:
+				return True
+		return False
+
+	def wins(self, bits):
+		for w in self.windows:
+			if bits & w == w:
+				return True
+		return False
+
+def window_evaluation(game, me, opp):
+	"""
+	Default evaluation for the side to move: every window still open to one
+	player only is worth 4 ** (stones in it) to that player.
+	"""
+	score = 0
+	for w in game.windows:
+		mine, theirs = me & w, opp & w
+		if mine and not theirs:
+			score += 4 ** bin(mine).count("1")
+		elif theirs and not mine:
+			score -= 4 ** bin(theirs).count("1")
+	return score
+
+class Timeout(Exception):
+	"""
+	Raised inside the search when the per-move deadline has passed.
+	"""
+
+class Searcher:
+	"""
+	Iterative deepening alpha-beta (negamax) with a transposition table,
+	killer moves and history heuristic, under a time budget per move.
+	"""
+	def __init__(self, game, evaluate=window_evaluation, time_limit=1.0, max_depth=None):
+		self.game = game
+		self.evaluate = evaluate
+		self.time_limit = time_limit
+		self.max_depth = max_depth if max_depth is not None else game.size
+		self.table = {}    # (me, opp) -> (depth, value, flag, move)
+		self.history = [0] * game.size
+		self.nodes = 0
+
+	def search(self, me, opp):
+		"""
+		Returns (move, value, depth reached) for the player owning `me`.
+		The move comes from the deepest iteration completed before the deadline.
+		"""
+		game = self.game
+		self.deadline = time.perf_counter() + self.time_limit
+		self.killers = [[None, None] for _ in range(game.size + 1)]
+		self.nodes = 0
+		empty = [c for c in game.order if not (me | opp) >> c & 1]
+		best_move, best_value, reached = (empty[0] if empty else None), 0, 0
+		for depth in range(1, min(self.max_depth, len(empty)) + 1):
+			try:
+				value, move = self._negamax(me, opp, depth, -INF, INF, 0)
+			except Timeout:
+				break
+			best_move, best_value, reached = move, value, depth
+			# Solved: a forced win or loss, deeper iterations cannot change it
+			if abs(value) >= WIN:
+				break
+		return best_move, best_value, reached
+
+	def _ordered(self, me, opp, ply, tt_move):
+		# TT move first, then killers, then by history score (static order breaks ties)
+		game = self.game
+		occupied = me | opp
+		moves = [c for c in game.order if not occupied >> c & 1]
+		history = self.history
+		killers = self.killers[ply]
+		def key(c):
+			if c == tt_move:
+				return -3
+			if c == killers[0]:
+				return -2
+			if c == killers[1]:
+				return -1
+			return -history[c]
+		moves.sort(key=key)
+		return moves
+
+	def _negamax(self, me, opp, depth, alpha, beta, ply):
+		self.nodes += 1
+		if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+			raise Timeout()
+		game = self.game
+		if me | opp == game.full:
+			return 0, None
+		if depth == 0:
+			return self.evaluate(game, me, opp), None
+		alpha0 = alpha
+		entry = self.table.get((me, opp))
+		tt_move = None
+		if entry is not None:
+			d, value, flag, tt_move = entry
+			if d >= depth:
+				if flag == 0:
+					return value, tt_move
+				if flag < 0 and value <= alpha:
+					return value, tt_move
+				if flag > 0 and value >= beta:
+					return value, tt_move
+		best, best_move = -INF, None
+		for c in self._ordered(me, opp, ply, tt_move):
+			bit = 1 << c
+			if game.wins_at(me | bit, c):
+				# Wins found with more depth left are quicker, worth more
+				value = WIN + depth
+			else:
+				value = -self._negamax(opp, me | bit, depth - 1, -beta, -alpha, ply + 1)[0]
+			if value > best:
+				best, best_move = value, c
+			if best > alpha:
+				alpha = best
+			if alpha >= beta:
+				killers = self.killers[ply]
+				if killers[0] != c:
+					killers[0], killers[1] = c, killers[0]
+				self.history[c] += depth * depth
+				break
+		# flag: 0 exact, -1 upper bound (fail low), 1 lower bound (fail high)
+		flag = -1 if best <= alpha0 else 1 if best >= beta else 0
+		self.table[(me, opp)] = (depth, best, flag, best_move)
+		return best, best_move
+
+def to_bits(board):
+	"""
+	Returns (X, O) bitboards of a nested list board of any size.
+	"""
+	cols = len(board[0])
+	x = o = 0
+	for i, row in enumerate(board):
+		for j, cell in enumerate(row):
+			if cell == "X":
+				x |= 1 << (i * cols + j)
+			elif cell == "O":
+				o |= 1 << (i * cols + j)
+	return x, o
+
+def best_move(board, k, time_limit=1.0, evaluate=window_evaluation):
+	"""
+	Returns the (i, j) move for the player to move on a nested list board,
+	searched for at most time_limit seconds.
+	"""
+	game = Game(len(board), len(board[0]), k)
+	x, o = to_bits(board)
+	me, opp = (x, o) if bin(x).count("1") == bin(o).count("1") else (o, x)
+	move = Searcher(game, evaluate, time_limit).search(me, opp)[0]
+	return None if move is None else divmod(move, game.cols)
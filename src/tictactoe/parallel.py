@@ -0,0 +1,121 @@
+"""
+Parallel root-split alpha-beta for m,n,k-games (young brothers wait at the root)
+
+Usage: python parallel.py [rows cols k depth]    (prints timings for 1, 2, 4, 8 workers)
+"""
+
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mnk import Game, window_evaluation, WIN, INF
+
+def negamax(game, me, opp, depth, alpha, beta, evaluate=window_evaluation):
+	"""
+	Fixed-depth fail-soft alpha-beta in static move order (no tables, so the
+	result does not depend on what was searched before).
+	"""
+	if me | opp == game.full:
+		return 0
+	if depth == 0:
+		return evaluate(game, me, opp)
+	best = -INF
+	occupied = me | opp
+	for c in game.order:
+		if occupied >> c & 1:
+			continue
+		bit = 1 << c
+		if game.wins_at(me | bit, c):
+			value = WIN + depth
+		else:
+			value = -negamax(game, opp, me | bit, depth - 1, -beta, -alpha, evaluate)
+		if value > best:
+			best = value
+			if best > alpha:
+				alpha = best
+				if alpha >= beta:
+					break
+	return best
+
+def root_moves(game, me, opp):
+	return [c for c in game.order if not (me | opp) >> c & 1]
+
+def search_move(game, me, opp, c, depth, alpha, beta, evaluate=window_evaluation):
+	"""
+	Value of root move c for the player owning `me`.
+	"""
+	bit = 1 << c
+	if game.wins_at(me | bit, c):
+		return WIN + depth
+	return -negamax(game, opp, me | bit, depth - 1, -beta, -alpha, evaluate)
+
+def serial_search(game, me, opp, depth, evaluate=window_evaluation):
+	"""
+	Returns (move, value): the first root move (static order) with the best value.
+	"""
+	alpha, best_move = -INF, None
+	for c in root_moves(game, me, opp):
+		value = search_move(game, me, opp, c, depth, alpha, INF, evaluate)
+		if value > alpha:
+			alpha, best_move = value, c
+	return best_move, alpha
+
+# Root alpha shared by all workers (set by the pool initializer)
+_alpha = None
+
+def _init(alpha):
+	global _alpha
+	_alpha = alpha
+
+def _search_child(args):
+	# Searches one root move against the best value found so far by any worker
+	game, me, opp, c, depth, evaluate = args
+	alpha = _alpha.value
+	value = search_move(game, me, opp, c, depth, alpha, INF, evaluate)
+	with _alpha.get_lock():
+		if value > _alpha.value:
+			_alpha.value = value
+	return c, value, alpha
+
+def parallel_search(game, me, opp, depth, workers=4, evaluate=window_evaluation):
+	"""
+	Same result as serial_search. The first root move is searched alone to
+	get a bound, the others are spread over a process pool sharing the root
+	alpha in shared memory. A child that fails low against a bound equal to
+	the final value is re-searched, so ties resolve like the serial order.
+	"""
+	moves = root_moves(game, me, opp)
+	if not moves:
+		return None, 0
+	first = search_move(game, me, opp, moves[0], depth, -INF, INF, evaluate)
+	results = {moves[0]: (first, -INF)}
+	if len(moves) > 1:
+		shared = multiprocessing.Value("q", first)
+		with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(shared,)) as pool:
+			tasks = [(game, me, opp, c, depth, evaluate) for c in moves[1:]]
+			for c, value, alpha in pool.map(_search_child, tasks):
+				results[c] = (value, alpha)
+	# Exact values beat the bound they were searched with; others are upper bounds
+	best = max(value for value, alpha in results.values() if value > alpha)
+	for c in moves:
+		value, alpha = results[c]
+		if value > alpha:
+			if value == best:
+				return c, best
+		elif value >= best and search_move(game, me, opp, c, depth, best - 1, best, evaluate) >= best:
+			return c, best
+	return None, best
+
+if __name__ == "__main__":
+	rows, cols, k, depth = (int(a) for a in sys.argv[1:5]) if len(sys.argv) > 4 else (4, 4, 4, 8)
+	game = Game(rows, cols, k)
+	t = time.perf_counter()
+	reference = serial_search(game, 0, 0, depth)
+	serial = time.perf_counter() - t
+	print(f"{rows}x{cols} k={k} depth {depth}: serial {serial:.2f}s, move {reference}")
+	for workers in (1, 2, 4, 8):
+		t = time.perf_counter()
+		found = parallel_search(game, 0, 0, depth, workers)
+		elapsed = time.perf_counter() - t
+		print(f"{workers} workers: {elapsed:.2f}s, speedup {serial / elapsed:.2f}x, same move: {found == reference}")
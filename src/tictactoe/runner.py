@@ -1,6 +1,7 @@
 import pygame
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import tictactoe as ttt
 
@@ -19,7 +20,14 @@ moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+
+# The computer searches on a worker thread, the window keeps handling events.
+# ai_search = (future of the move, board it was asked for, start time)
+executor = ThreadPoolExecutor(max_workers=1)
+ai_search = None
+# Shortest time the computer appears to think, in seconds. Off by default:
+# the move is played as soon as it is found (a cosmetic pause if set)
+AI_DELAY = 0
 
 while True:
 
@@ -108,15 +116,16 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move: start the search, play it once done
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
+            if ai_search is None:
+                ai_search = (executor.submit(ttt.minimax, board), board, time.time())
             else:
-                ai_turn = True
+                future, asked, started = ai_search
+                if future.done() and time.time() - started >= AI_DELAY:
+                    ai_search = None
+                    if asked is board:
+                        board = ttt.result(board, future.result())
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +150,9 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    # Drop a search still running for the old game
+                    if ai_search is not None:
+                        ai_search[0].cancel()
+                        ai_search = None
 
     pygame.display.flip()
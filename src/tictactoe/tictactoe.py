@@ -2,8 +2,11 @@
 Tic Tac Toe Player
 """
 
-import numpy as np
-from copy import deepcopy
+import time
+import tracemalloc
+
+import book
+import engine
 
 class InvalidActionError(Exception):
 	"""
@@ -42,7 +45,7 @@ def result(board, action):
 	"""
 	if not (0 <= action[0] < 3 and 0 <= action[1] < 3) or board[action[0]][action[1]] != EMPTY:
 		raise InvalidActionError(action, board, "Invalid move.")
-	board_copy = deepcopy(board)
+	board_copy = [row[:] for row in board]
 	board_copy[action[0]][action[1]] = player(board)
 	return board_copy
 
@@ -50,26 +53,16 @@ def winner(board):
 	"""
 	Returns the winner of the game, if there is one.
 	"""
-	values = {"X": 1, "O": -1, None: 0}
-	state = np.array([values[cell] for row in board for cell in row])
-    # rows 0, 1, 2 -> win in rows 1, 2, 3;
-	# rows 3, 4, 5 -> wins in cols 1, 2, 3;
-	# rows 6, 7, 8 -> wins in diagonal / anti-diagonal;
-	sums = np.array([[1, 1, 1, 0, 0, 0, 0, 0, 0],
-				  	[0, 0, 0, 1, 1, 1, 0, 0, 0],
-					[0, 0, 0, 0, 0, 0, 1, 1, 1],
-					[1, 0, 0, 1, 0, 0, 1, 0, 0],
-					[0, 1, 0, 0, 1, 0, 0, 1, 0],
-					[0, 0, 1, 0, 0, 1, 0, 0, 1],
-					[1, 0, 0, 0, 1, 0, 0, 0, 1],
-					[0, 0, 1, 0, 1, 0, 1, 0, 0]]) @ state # Matrix product: winning positions, board
-	return X if 3 in sums else O if -3 in sums else None
+	# Bitboards checked against the precomputed win masks (rows, cols, diagonals)
+	x, o = engine.to_bits(board)
+	return X if engine.wins(x) else O if engine.wins(o) else None
 
 def terminal(board):
 	"""
 	Returns True if game is over (win / tie), False otherwise.
 	"""
-	return True if winner(board) or not actions(board) else False
+	x, o = engine.to_bits(board)
+	return engine.wins(x) or engine.wins(o) or x | o == engine.FULL
 
 def utility(board):
 	"""
@@ -77,37 +70,126 @@ def utility(board):
 	"""
 	return {X: 1, O: -1}.get(winner(board), 0)
 
-# With alpha-beta pruning:
-def max_value(board, alpha, beta):
+# The other two cells of every line through each cell (cells numbered 3 * i + j)
+LINES_THROUGH = tuple(
+	tuple(tuple(d for d in line if d != c) for line in
+		  [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)] if c in line)
+	for c in range(9)
+)
+
+# Place values of the cells in SearchBoard.key
+POW3 = tuple(3 ** c for c in range(9))
+
+class SearchBoard:
+	"""
+	Mutable board for the search: moves are made and undone in place, with the
+	side to move, the empty cells and the winner kept up to date incrementally
+	(only the lines through the last move are checked). No allocation per move.
+	The public result() stays immutable.
+	"""
+	__slots__ = ("cells", "empty", "where", "turn", "won", "key")
+
+	def __init__(self, board):
+		self.cells = [cell for row in board for cell in row]
+		self.empty = [c for c in range(9) if self.cells[c] is EMPTY]
+		self.where = [0] * 9  # where[c]: index of empty cell c in empty
+		for k, c in enumerate(self.empty):
+			self.where[c] = k
+		self.turn = player(board)
+		self.won = winner(board)
+		# Base 3 code of the cells (0 empty, 1 X, 2 O), the transposition table key
+		self.key = sum(POW3[c] * (1 if self.cells[c] == X else 2) for c in range(9) if self.cells[c] is not EMPTY)
+
+	def terminal(self):
+		return self.won is not None or not self.empty
+
+	def utility(self):
+		return 1 if self.won == X else -1 if self.won == O else 0
+
+	def make_move(self, k):
+		"""
+		Plays the k-th empty cell (cell c is empty[where[c]]); undo_move(k, c)
+		restores the board exactly, including the order of the empty cells.
+		Returns the cell played.
+		"""
+		empty = self.empty
+		c = empty[k]
+		# Swap-remove: the last empty cell takes slot k
+		last = empty.pop()
+		if last != c:
+			empty[k] = last
+			self.where[last] = k
+		cells, turn = self.cells, self.turn
+		cells[c] = turn
+		self.key += POW3[c] if turn == X else 2 * POW3[c]
+		for a, b in LINES_THROUGH[c]:
+			if cells[a] == turn and cells[b] == turn:
+				self.won = turn
+				break
+		self.turn = O if turn == X else X
+		return c
+
+	def undo_move(self, k, c):
+		empty, where = self.empty, self.where
+		if k == len(empty):
+			empty.append(c)
+		else:
+			last = empty[k]
+			empty.append(last)
+			where[last] = len(empty) - 1
+			empty[k] = c
+		where[c] = k
+		self.cells[c] = EMPTY
+		self.turn = turn = O if self.turn == X else X
+		self.key -= POW3[c] if turn == X else 2 * POW3[c]
+		self.won = None
+
+# Counters of max_value / min_value (see search_stats), None when not recording
+STATS = None
+
+# With alpha-beta pruning, on a SearchBoard (moves are cell numbers):
+def max_value(state, alpha, beta):
 	"""
 	Returns the best utility value for the max player with alpha-beta pruning.
 	(Helper function)
 	"""
-	if terminal(board):
-		return utility(board), None
+	if STATS is not None:
+		STATS["expanded"] += 1
+	if state.terminal():
+		return state.utility(), None
 	v, best_move = float('-inf'), None
-	for action in actions(board):
-		min_val, move = min_value(result(board, action), alpha, beta)
+	for k in range(len(state.empty)):
+		c = state.make_move(k)
+		min_val, move = min_value(state, alpha, beta)
+		state.undo_move(k, c)
 		if min_val > v:
-			v, best_move = min_val, action
+			v, best_move = min_val, c
 		if v >= beta:
+			if STATS is not None:
+				STATS["cutoffs"] += 1
 			return v, best_move
 		alpha = max(alpha, v)
 	return v, best_move
 
-def min_value(board, alpha, beta):
+def min_value(state, alpha, beta):
 	"""
 	Returns the best utility value for the min player with alpha-beta pruning.
 	(Helper function)
 	"""
-	if terminal(board):
-		return utility(board), None
+	if STATS is not None:
+		STATS["expanded"] += 1
+	if state.terminal():
+		return state.utility(), None
 	v, best_move = float('inf'), None
-	for action in actions(board):
-		max_val, move = max_value(result(board, action), alpha, beta)
+	for k in range(len(state.empty)):
+		c = state.make_move(k)
+		max_val, move = max_value(state, alpha, beta)
+		state.undo_move(k, c)
 		if max_val < v:
-			v, best_move = max_val, action
+			v, best_move = max_val, c
 		if v <= alpha:
+			if STATS is not None:
+				STATS["cutoffs"] += 1
 			return v, best_move
 		beta = min(beta, v)
 	return v, best_move
@@ -115,46 +197,227 @@ def min_value(board, alpha, beta):
 def minimax(board):
 	"""
 	Returns the optimal action for the current player on the board.
+	Read from the precomputed opening book (book.py) when book.bin exists,
+	otherwise solved on bitboards with a symmetry-keyed transposition table
+	(engine.py). max_value / min_value above are the equivalent search on a
+	SearchBoard.
 	"""
-	if player(board) == X:
-		return max_value(board, float('-inf'), float('inf'))[1]
-	elif player(board) == O:
-		return min_value(board, float('-inf'), float('inf'))[1]
-	else: # Terminal
+	if terminal(board):
 		return None
+	x, o = engine.to_bits(board)
+	entry = book.lookup(x, o)
+	move = entry[1] if entry is not None else engine.best_move(x, o)[1]
+	return divmod(move, 3)
 
-# Without alpha-beta pruning:
-"""
-def max_value(board):
-    # Returns the best utility value for the max player.
-    # (Helper function)
-    if terminal(board):
-        return utility(board), None
-    v, best_move = float('-inf'), None
-    for action in actions(board):
-        min_val, move = min_value(result(board, action))
-        if min_val > v:
-            v, best_move = min_val, action
-    return v, best_move
-
-def min_value(board):
-    # Returns the best utility value for the min player.
-    # (Helper function)
-    if terminal(board):
-        return utility(board), None
-    v, best_move = float('inf'), None
-    for action in actions(board):
-        max_val, move = max_value(result(board, action))
-        if max_val < v:
-            v, best_move = max_val, action
-    return v, best_move
+def alphabeta(board):
+	"""
+	Returns the optimal action for the current player, using max_value / min_value.
+	"""
+	if terminal(board):
+		return None
+	state = SearchBoard(board)
+	search = max_value if state.turn == X else min_value
+	return divmod(search(state, float('-inf'), float('inf'))[1], 3)
 
-def minimax(board):
-    # Returns the optimal action for the current player on the board.
-    if terminal(board):
-        return None
-    if player(board) == X:
-        return max_value(board)[1]
-    elif player(board) == O:
-        return min_value(board)[1]
-"""
\ No newline at end of file
+def search_stats(board, search=alphabeta, memory=False):
+	"""
+	Runs search(board) while counting the max_value / min_value nodes.
+	Returns (action, record), the record being a dict with the same fields
+	as the snake search records: algorithm, expanded, cutoffs, time and
+	peak_memory (bytes, only with memory=True, which is much slower).
+	"""
+	global STATS
+	STATS = record = {"algorithm": search.__name__, "expanded": 0, "cutoffs": 0, "time": 0.0, "peak_memory": 0}
+	if memory:
+		tracemalloc.start()
+	t = time.perf_counter()
+	try:
+		action = search(board)
+	finally:
+		record["time"] = time.perf_counter() - t
+		if memory:
+			record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+			tracemalloc.stop()
+		STATS = None
+	return action, record
+
+# Without alpha-beta pruning (kept as a reference engine, see match.py):
+def plain_max_value(state):
+	"""
+	Returns the best utility value for the max player, without pruning.
+	(Helper function)
+	"""
+	if STATS is not None:
+		STATS["expanded"] += 1
+	if state.terminal():
+		return state.utility(), None
+	v, best_move = float('-inf'), None
+	for k in range(len(state.empty)):
+		c = state.make_move(k)
+		min_val, move = plain_min_value(state)
+		state.undo_move(k, c)
+		if min_val > v:
+			v, best_move = min_val, c
+	return v, best_move
+
+def plain_min_value(state):
+	"""
+	Returns the best utility value for the min player, without pruning.
+	(Helper function)
+	"""
+	if STATS is not None:
+		STATS["expanded"] += 1
+	if state.terminal():
+		return state.utility(), None
+	v, best_move = float('inf'), None
+	for k in range(len(state.empty)):
+		c = state.make_move(k)
+		max_val, move = plain_max_value(state)
+		state.undo_move(k, c)
+		if max_val < v:
+			v, best_move = max_val, c
+	return v, best_move
+
+def plain_minimax(board):
+	"""
+	Returns the optimal action for the current player, searching the whole tree.
+	"""
+	if terminal(board):
+		return None
+	state = SearchBoard(board)
+	search = plain_max_value if state.turn == X else plain_min_value
+	return divmod(search(state)[1], 3)
+
+# With move ordering, principal variation search and aspiration windows:
+
+# Static order: centre, corners, edges
+ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+RANK = tuple(ORDER.index(c) for c in range(9))
+
+# Transposition table flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class OrderedSearch:
+	"""
+	Negamax alpha-beta on a SearchBoard with move ordering. ordering is any of
+	"static" (centre, corners, edges), "tt" (best move stored in the
+	transposition table first, which also enables the table cutoffs),
+	"threats" (winning moves, then blocks) and "history" (moves that caused
+	cutoffs before first; on 3x3 it loses to the static order, so it is off
+	by default). pvs=True searches all but the first move with a null window
+	(NegaScout), aspiration=guess starts the root with the window
+	(guess - 1, guess + 1) and widens it on failure.
+	Values are from X's point of view like minimax: 1, 0 or -1.
+	"""
+	def __init__(self, ordering=("static", "tt", "threats"), pvs=False, aspiration=None):
+		self.static = "static" in ordering
+		self.tt = "tt" in ordering
+		self.threats = "threats" in ordering
+		self.history = [0] * 9 if "history" in ordering else None
+		self.pvs = pvs
+		self.aspiration = aspiration
+		self.table = {}
+
+	def search(self, board):
+		"""
+		Returns (value, action) for the player to move.
+		"""
+		state = SearchBoard(board)
+		sign = 1 if state.turn == X else -1
+		alpha, beta = -2, 2
+		if self.aspiration is not None:
+			guess = sign * self.aspiration
+			alpha, beta = guess - 1, guess + 1
+		while True:
+			value, move = self._negamax(state, alpha, beta)
+			if value <= alpha and alpha > -2:
+				alpha = -2
+			elif value >= beta and beta < 2:
+				beta = 2
+			else:
+				break
+		return sign * value, None if move is None else divmod(move, 3)
+
+	def _ordered(self, state, tt_move):
+		moves = state.empty[:]
+		history = self.history
+		if history is not None:
+			moves.sort(key=(lambda c: (-history[c], RANK[c])) if self.static else (lambda c: -history[c]))
+		elif self.static:
+			moves.sort(key=RANK.__getitem__)
+		if self.threats:
+			# Stable sort: wins first, then blocks of the opponent's wins
+			cells, turn = state.cells, state.turn
+			def threat(c):
+				for a, b in LINES_THROUGH[c]:
+					if cells[a] == cells[b] == turn:
+						return 0
+				for a, b in LINES_THROUGH[c]:
+					if cells[a] is not EMPTY and cells[a] == cells[b]:
+						return 1
+				return 2
+			moves.sort(key=threat)
+		if tt_move is not None:
+			moves.remove(tt_move)
+			moves.insert(0, tt_move)
+		return moves
+
+	def _negamax(self, state, alpha, beta):
+		# Returns (value for the side to move, best cell), fail-soft
+		if STATS is not None:
+			STATS["expanded"] += 1
+		if state.won is not None:
+			return -1, None  # The previous move won
+		if not state.empty:
+			return 0, None
+		alpha0 = alpha
+		tt_move = None
+		if self.tt:
+			entry = self.table.get(state.key)
+			if entry is not None:
+				value, flag, tt_move = entry
+				if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+					return value, tt_move
+		best, best_move = -2, None
+		for i, c in enumerate(self._ordered(state, tt_move)):
+			k = state.where[c]
+			state.make_move(k)
+			if i == 0 or not self.pvs:
+				value = -self._negamax(state, -beta, -alpha)[0]
+			else:
+				value = -self._negamax(state, -alpha - 1, -alpha)[0]
+				if alpha < value < beta:
+					value = -self._negamax(state, -beta, -value)[0]
+			state.undo_move(k, c)
+			if value > best:
+				best, best_move = value, c
+				if value > alpha:
+					alpha = value
+					if alpha >= beta:
+						if STATS is not None:
+							STATS["cutoffs"] += 1
+						if self.history is not None:
+							self.history[c] += len(state.empty) ** 2
+						break
+		if self.tt:
+			flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+			self.table[state.key] = (best, flag, best_move)
+		return best, best_move
+
+def ordered_alphabeta(board):
+	"""
+	Returns the optimal action for the current player: alpha-beta with static,
+	transposition table and threat move ordering.
+	"""
+	if terminal(board):
+		return None
+	return OrderedSearch().search(board)[1]
+
+def negascout(board):
+	"""
+	Returns the optimal action for the current player: ordered principal
+	variation search with an aspiration window around a draw.
+	"""
+	if terminal(board):
+		return None
+	return OrderedSearch(pvs=True, aspiration=0).search(board)[1]